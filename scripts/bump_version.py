@@ -10,10 +10,19 @@ import subprocess
 import sys
 from pathlib import Path
 
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
 # File paths
 PYPROJECT_PATH = Path("pyproject.toml").absolute()
 INIT_PATH = Path("src/web_grabber/__init__.py").absolute()
 
+# Version patterns, used when the file can't be parsed as TOML
+PYPROJECT_VERSION_RE = re.compile(r'version\s*=\s*"(\d+)\.(\d+)\.(\d+)"')
+INIT_VERSION_RE = re.compile(r'__version__\s*=\s*"([^"]+)"')
+
 
 def parse_args():
     """Parse command line arguments."""
@@ -26,6 +35,30 @@ def parse_args():
     return parser.parse_args()
 
 
+def find_project_version(content):
+    """Find the project version in pyproject.toml content.
+
+    Returns a (start, end, version) tuple spanning the version assignment,
+    or None if it can't be found.
+    """
+    if tomllib is not None:
+        try:
+            version = tomllib.loads(content).get("project", {}).get("version")
+        except tomllib.TOMLDecodeError:
+            version = None
+        if version:
+            assignment = f'version = "{version}"'
+            start = content.find(assignment)
+            if start != -1:
+                return start, start + len(assignment), version
+
+    match = PYPROJECT_VERSION_RE.search(content)
+    if match:
+        return match.start(), match.end(), ".".join(match.groups())
+
+    return None
+
+
 def bump_version_in_pyproject(dry_run=False):
     """Update the version in pyproject.toml."""
     if not PYPROJECT_PATH.exists():
@@ -35,19 +68,20 @@ def bump_version_in_pyproject(dry_run=False):
     content = PYPROJECT_PATH.read_text()
 
     # Find current version
-    version_pattern = re.compile(r'version\s*=\s*"(\d+)\.(\d+)\.(\d+)"')
-    match = version_pattern.search(content)
+    found = find_project_version(content)
+    parts = found[2].split(".") if found else []
 
-    if not match:
+    if len(parts) != 3 or not all(part.isdigit() for part in parts):
         print("Error: Could not find version string in pyproject.toml")
         return False
 
-    major, minor, patch = map(int, match.groups())
+    start, end, _ = found
+    major, minor, patch = map(int, parts)
     new_patch = patch + 1
     new_version = f"{major}.{minor}.{new_patch}"
 
     # Replace version
-    new_content = version_pattern.sub(f'version = "{new_version}"', content)
+    new_content = f'{content[:start]}version = "{new_version}"{content[end:]}'
 
     if not dry_run:
         PYPROJECT_PATH.write_text(new_content)
@@ -71,8 +105,7 @@ def bump_version_in_init(new_version, dry_run=False):
     content = INIT_PATH.read_text()
 
     # Find current version
-    version_pattern = re.compile(r'__version__\s*=\s*"([^"]+)"')
-    match = version_pattern.search(content)
+    match = INIT_VERSION_RE.search(content)
 
     if not match:
         print("Error: Could not find __version__ in __init__.py")
@@ -81,9 +114,14 @@ def bump_version_in_init(new_version, dry_run=False):
     current_version = match.group(1)
 
     # Replace version
-    new_content = version_pattern.sub(f'__version__ = "{new_version}"', content)
+    new_content = (
+        f'{content[: match.start()]}__version__ = "{new_version}"'
+        f"{content[match.end() :]}"
+    )
 
-    if not dry_run:
+    if new_content == content:
+        print(f"__init__.py is already at version {new_version}")
+    elif not dry_run:
         INIT_PATH.write_text(new_content)
         print(f"Updated version in __init__.py: {current_version} -> {new_version}")
     else:
@@ -98,7 +136,8 @@ def stage_files(dry_run=False):
     """Stage the modified version files."""
     try:
         if not dry_run:
-            # Stage the modified files
+            # Stage the modified files. git passes the index being committed
+            # to hooks through GIT_INDEX_FILE, which the git CLI picks up.
             subprocess.run(
                 ["git", "add", str(PYPROJECT_PATH), str(INIT_PATH)], check=True
             )
@@ -106,7 +145,7 @@ def stage_files(dry_run=False):
         else:
             print(f"[DRY RUN] Would stage files: {PYPROJECT_PATH} and {INIT_PATH}")
         return True
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print(f"Error staging files: {e}")
         return False
 
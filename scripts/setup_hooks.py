@@ -3,11 +3,25 @@
 Script to set up pre-commit hooks for the project.
 """
 
+import argparse
+import importlib.util
+import shutil
 import subprocess
 import sys
 from pathlib import Path
 
 
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Set up pre-commit hooks")
+    parser.add_argument(
+        "--ci",
+        action="store_true",
+        help="Also dry-run the version bump script to check it works",
+    )
+    return parser.parse_args()
+
+
 def check_git_repo():
     """Check if we're in a git repository."""
     if not Path(".git").exists():
@@ -20,19 +34,21 @@ def check_git_repo():
 
 def install_pre_commit():
     """Install pre-commit if not already installed."""
-    try:
-        subprocess.run(["pre-commit", "--version"], check=True, stdout=subprocess.PIPE)
+    # Look for the module or the executable instead of spawning pre-commit
+    if importlib.util.find_spec("pre_commit") or shutil.which("pre-commit"):
         print("pre-commit is already installed.")
         return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("Installing pre-commit...")
-        try:
-            subprocess.run(["pip", "install", "pre-commit"], check=True)
-            print("pre-commit successfully installed.")
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"Error installing pre-commit: {e}")
-            return False
+
+    print("Installing pre-commit...")
+    try:
+        subprocess.run(
+            [sys.executable, "-m", "pip", "install", "pre-commit"], check=True
+        )
+        print("pre-commit successfully installed.")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"Error installing pre-commit: {e}")
+        return False
 
 
 def install_hooks():
@@ -99,6 +115,8 @@ def test_version_bump():
 
 def main():
     """Main function to set up pre-commit hooks."""
+    args = parse_args()
+
     print("Setting up pre-commit hooks...")
 
     if not check_git_repo():
@@ -113,7 +131,9 @@ def main():
     if not install_hooks():
         return 1
 
-    if not test_version_bump():
+    # The hook runs the bump script on every commit anyway, so only CI needs
+    # the separate dry run
+    if args.ci and not test_version_bump():
         print("Warning: Version bump script test failed, but continuing...")
 
     print("All done! Pre-commit hooks are set up and ready to use.")
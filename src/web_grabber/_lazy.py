@@ -0,0 +1,35 @@
+"""Lazy attribute imports for package __init__ modules."""
+
+import importlib
+from typing import Any, Callable, Dict
+
+
+def make_lazy_getattr(
+    namespace: Dict[str, Any], lazy_imports: Dict[str, str]
+) -> Callable[[str], Any]:
+    """
+    Build a module __getattr__ that imports attributes on first access.
+
+    Each attribute is cached in the module's namespace once imported, so later
+    accesses don't go through __getattr__ again.
+
+    Args:
+        namespace: The module's globals()
+        lazy_imports: Module to import each attribute name from
+
+    Returns:
+        The function to assign to the module's __getattr__
+    """
+
+    def lazy_getattr(name: str) -> Any:
+        module_name = lazy_imports.get(name)
+        if module_name is None:
+            raise AttributeError(
+                f"module {namespace['__name__']!r} has no attribute {name!r}"
+            )
+
+        value = getattr(importlib.import_module(module_name), name)
+        namespace[name] = value
+        return value
+
+    return lazy_getattr
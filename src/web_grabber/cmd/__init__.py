@@ -1,5 +1,9 @@
 """Command-line interface modules for Web Grabber."""
 
-from web_grabber.cmd.grab import GrabHandler, grab_command
+from web_grabber._lazy import make_lazy_getattr
+from web_grabber.cmd.grab import grab_command
+
+# Defer to web_grabber.cmd.grab, which imports the crawler on first access
+__getattr__ = make_lazy_getattr(globals(), {"GrabHandler": "web_grabber.cmd.grab"})
 
 __all__ = ["grab_command", "GrabHandler"]
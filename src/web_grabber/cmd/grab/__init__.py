@@ -1,6 +1,13 @@
 """Grab command module for web-grabber."""
 
+from web_grabber._lazy import make_lazy_getattr
 from web_grabber.cmd.grab.grab import grab_command
-from web_grabber.cmd.grab.grab_handler import GrabHandler
+
+# The crawler pulls in the whole network stack, so it's only imported on first
+# access and `--help` stays fast
+_LAZY_IMPORTS = {"GrabHandler": "web_grabber.cmd.grab.grab_handler"}
+
+__getattr__ = make_lazy_getattr(globals(), _LAZY_IMPORTS)
+
 
 __all__ = ["grab_command", "GrabHandler"]
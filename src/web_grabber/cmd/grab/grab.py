@@ -1,20 +1,59 @@
 """Command for grabbing web content in web-grabber."""
 
+import functools
 import logging
 import os
+import re
 import sys
 from urllib.parse import urlparse
 
 import typer
-from prompt_toolkit import prompt
-from prompt_toolkit.completion import PathCompleter
-from prompt_toolkit.styles import Style
-
-from web_grabber.cmd.grab.grab_handler import GrabHandler
 
 logger = logging.getLogger(__name__)
 
+# URL schemes the grabber can crawl
+_SCHEMES = ("http://", "https://")
+
+# Web-server host labels (www., www2., ...) that don't name the site itself
+_WWW_RE = re.compile(r"^www\d*\.")
+
+# Crawl backend for each (httpx, selenium, camoufox) flag combination
+_BACKEND_TABLE = {
+    (False, False, False): "requests",
+    (True, False, False): "httpx",
+    (False, True, False): "selenium",
+    (True, True, False): "selenium",
+    (False, False, True): "camoufox",
+    (True, False, True): "camoufox",
+    (False, True, True): "camoufox",
+    (True, True, True): "camoufox",
+}
+
+# (httpx, selenium, camoufox) flags handed to the crawler for each backend
+_BACKEND_FLAGS = {
+    "requests": (False, False, False),
+    "httpx": (True, False, False),
+    "selenium": (False, True, False),
+    "camoufox": (False, False, True),
+}
+
+
+def _ensure_scheme(url: str) -> str:
+    """
+    Default a URL without an http(s) scheme to https.
+
+    Args:
+        url: The URL as given by the user
+
+    Returns:
+        The URL with a scheme
+    """
+    if url.startswith(_SCHEMES):
+        return url
+    return "https://" + url
+
 
+@functools.lru_cache(maxsize=1024)
 def extract_domain_from_url(url: str) -> str:
     """
     Extract domain name from URL to use as directory name.
@@ -26,18 +65,33 @@ def extract_domain_from_url(url: str) -> str:
         Domain name suitable for use as directory name
     """
     # Make sure URL has a scheme
-    if not url.startswith(("http://", "https://")):
-        url = "https://" + url
-        
-    # Parse URL and extract netloc
-    parsed = urlparse(url)
-    domain = parsed.netloc
-    
-    # Remove www. prefix if present
-    if domain.startswith("www."):
-        domain = domain[4:]
-        
-    return domain
+    url = _ensure_scheme(url)
+
+    # Use the lowercased host without port or credentials, which can't be
+    # part of a directory name everywhere, and drop any www. style prefix
+    return _WWW_RE.sub("", urlparse(url).hostname or "", count=1)
+
+
+@functools.lru_cache(maxsize=1)
+def _prompt_widgets():
+    """
+    Build the prompt style and path completer on first use.
+
+    Returns:
+        Tuple of the prompt style and the directory path completer
+    """
+    # prompt_toolkit is slow to import and only needed in interactive mode
+    from prompt_toolkit.completion import PathCompleter
+    from prompt_toolkit.styles import Style
+
+    style = Style.from_dict({
+        'prompt': 'bold green',
+    })
+    completer = PathCompleter(
+        expanduser=True,
+        only_directories=True,
+    )
+    return style, completer
 
 
 def get_output_directory(url: str, suggested_dir: str = None) -> str:
@@ -51,26 +105,18 @@ def get_output_directory(url: str, suggested_dir: str = None) -> str:
     Returns:
         Selected output directory path
     """
+    from prompt_toolkit import prompt
+
     # Extract domain for default directory name
     domain = extract_domain_from_url(url)
     
-    # Use current directory as base path
-    current_dir = os.getcwd()
-    
-    # Use domain-based directory if no suggested directory was provided
+    # Use a domain-based directory in the current directory if no suggested
+    # directory was provided; only then is the working directory needed
     if not suggested_dir or suggested_dir == "./grabbed_site":
-        suggested_dir = os.path.join(current_dir, domain)
-    
-    # Set up prompt style
-    style = Style.from_dict({
-        'prompt': 'bold green',
-    })
+        suggested_dir = os.path.join(os.getcwd(), domain)
     
-    # Create path completer
-    completer = PathCompleter(
-        expanduser=True,
-        only_directories=True,
-    )
+    # Set up prompt style and path completer
+    style, completer = _prompt_widgets()
     
     # Prompt user for output directory with path completion
     message = [
@@ -113,14 +159,43 @@ def grab_command(
         False, help="Use camoufox for anti-bot protection (overrides --selenium)"
     ),
     threads: int = typer.Option(5, help="Number of concurrent threads for crawling"),
-    delay: float = typer.Option(0.5, help="Delay between requests (in seconds)"),
+    delay: float = typer.Option(
+        0.5, help="Delay between requests to the same host (in seconds)"
+    ),
     timeout: int = typer.Option(30, help="Request timeout (in seconds)"),
     user_agent: str = typer.Option(
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.81 Safari/537.36",
         help="User agent string",
     ),
     verbose: bool = typer.Option(False, help="Enable verbose logging"),
-    retry_failed: bool = typer.Option(False, help="Retry previously failed URLs"),
+    retry_failed: bool = typer.Option(
+        False,
+        help="Retry previously failed URLs and resume the interrupted crawl "
+        "in the output directory",
+    ),
+    parse_processes: int = typer.Option(
+        0,
+        help="Parse pages in this many worker processes, e.g. the number of CPU "
+        "cores (0 parses in the crawl threads)",
+    ),
+    aria2: bool = typer.Option(
+        False,
+        help="Download page resources in batches with aria2c, if installed "
+        "(not paced by --delay)",
+    ),
+    bloom_capacity: int = typer.Option(
+        0,
+        help="Track visited URLs in a Bloom filter sized for this many URLs, "
+        "for very large crawls (0 tracks them exactly in memory)",
+    ),
+    bloom_fp: float = typer.Option(
+        1e-4, help="False positive rate of the visited-URL Bloom filter"
+    ),
+    max_file_size: int = typer.Option(
+        0,
+        help="Skip resources larger than this many MiB, going by their "
+        "Content-Length (0 for no limit)",
+    ),
     non_interactive: bool = typer.Option(
         False, help="Run in non-interactive mode (no prompts)"
     ),
@@ -131,18 +206,22 @@ def grab_command(
     Example:
         web-grabber grab https://example.com --depth 5
     """
-    # Configure logging based on verbosity
-    log_level = logging.DEBUG if verbose else logging.INFO
+    # Configure logging based on verbosity. Under the main app its callback
+    # has already configured logging, which turns basicConfig into a no-op,
+    # so --verbose has to raise the level itself.
     logging.basicConfig(
-        level=log_level,
+        level=logging.INFO,
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         handlers=[logging.StreamHandler(sys.stdout)],
     )
+    if verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
 
     # Validate URL
-    if not url.startswith(("http://", "https://")):
-        url = "https://" + url
-        logger.info(f"URL modified to include scheme: {url}")
+    full_url = _ensure_scheme(url)
+    if full_url != url:
+        url = full_url
+        logger.info("URL modified to include scheme: %s", url)
 
     # Determine output directory
     if non_interactive:
@@ -150,22 +229,20 @@ def grab_command(
         if not output_dir:
             domain = extract_domain_from_url(url)
             output_dir = os.path.join(os.getcwd(), domain)
-            logger.info(f"Using auto-generated output directory: {output_dir}")
+            logger.info("Using auto-generated output directory: %s", output_dir)
     else:
         # In interactive mode, prompt for output directory
         output_dir = get_output_directory(url, output_dir)
-        logger.info(f"Selected output directory: {output_dir}")
+        logger.info("Selected output directory: %s", output_dir)
 
-    # Override httpx if browser automation is requested
-    if selenium or camoufox:
-        if httpx:
-            logger.info("Disabling httpx as browser automation was requested")
-            httpx = False
+    # Resolve the backend once; browser automation overrides httpx and
+    # camoufox overrides selenium
+    backend = _BACKEND_TABLE[(httpx, selenium, camoufox)]
+    logger.debug("Using %s as the crawl backend", backend)
+    httpx, selenium, camoufox = _BACKEND_FLAGS[backend]
 
-    # Override selenium if camoufox is specified
-    if camoufox and selenium:
-        logger.info("Overriding selenium with camoufox as both were specified")
-        selenium = False
+    # Import the crawler only once we know we'll run it, keeping --help fast
+    from web_grabber.cmd.grab.grab_handler import GrabHandler
 
     # Create and configure the grab handler
     handler = GrabHandler()
@@ -187,6 +264,11 @@ def grab_command(
         max_depth=depth,
         restrict_domain=True,
         debug=verbose,
+        aria2=aria2,
+        parse_processes=parse_processes,
+        bloom_capacity=bloom_capacity,
+        bloom_error_rate=bloom_fp,
+        max_file_size=max_file_size * 1024 * 1024,
     )
 
     # Start the crawl process
@@ -202,9 +284,11 @@ def grab_command(
     # Get summary and log results
     summary = handler.get_summary()
     logger.info(
-        f"Crawl summary: Visited {summary['visited_urls']} pages, "
-        f"failed {summary['failed_urls']} requests, "
-        f"downloaded resources: {summary['resources']}"
+        "Crawl summary: Visited %s pages, failed %s requests, "
+        "downloaded resources: %s",
+        summary["visited_urls"],
+        summary["failed_urls"],
+        summary["resources"],
     )
 
     return summary
@@ -1,33 +1,207 @@
 """Handler for grab command functionality."""
 
+import asyncio
+import hashlib
 import logging
+import multiprocessing
 import os
 import re
+import threading
 import time
 import urllib.parse
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Deque, Dict, List, Optional, Set, TextIO, Tuple, Union
 
 from web_grabber.lib.browser_automation import (
     BrowserAutomation,
 )
+from web_grabber.lib.dedup import VisitedUrlSet
 from web_grabber.lib.network import (
+    DnsCache,
+    HttpxHandler,
     NetworkHandler,
+    TorHandler,
 )
 
 logger = logging.getLogger(__name__)
 
+# URL schemes the grabber can crawl
+_SCHEMES = ("http://", "https://")
+
+# Characters not allowed in saved filenames
+_SANITIZE_RE = re.compile(r"[^\w\-.]")
+
+# Tags, kept as they are, or runs of digits and whitespace in the text between
+# them, which differ between otherwise identical pages through timestamps,
+# counters and reformatting
+_VOLATILE_TEXT_RE = re.compile(r"(<[^>]*>)|[\d\s]+")
+
+# Same rule as _SANITIZE_RE for ASCII names, applied with str.translate
+_SANITIZE_TABLE = {
+    c: "_" for c in range(128) if not (chr(c).isalnum() or chr(c) in "-_.")
+}
+
+# Extensions kept as-is when saving each resource type
+_RESOURCE_EXTS = {
+    "images": frozenset(
+        {".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".bmp", ".ico"}
+    ),
+    "videos": frozenset({".mp4", ".webm", ".avi", ".mov", ".wmv", ".flv", ".mkv"}),
+    "documents": frozenset({".pdf", ".doc", ".docx", ".xls", ".xlsx", ".txt"}),
+}
+
+# Extension given to resources saved without a fitting one
+_DEFAULT_EXTS = {"images": ".jpg", "videos": ".mp4", "documents": ".pdf"}
+
+# Extensions that mark a page URL as really being another type of resource
+_PAGE_PATH_TYPES = {
+    **dict.fromkeys(
+        (".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx"), "documents"
+    ),
+    **dict.fromkeys((".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg"), "images"),
+    **dict.fromkeys((".mp4", ".webm", ".avi", ".mov", ".wmv", ".flv"), "videos"),
+}
+
+# Leading bytes of file formats that a page URL can turn out to serve
+_SIGNATURE_TYPES = (
+    (b"%PDF-", "documents"),
+    (b"\xff\xd8\xff", "images"),  # JPEG
+    (b"\x89PNG\r\n\x1a\n", "images"),
+    (b"GIF87a", "images"),
+    (b"GIF89a", "images"),
+)
+
+# Pages a browser serves before it's restarted, since long-lived browser
+# processes keep growing in memory
+_BROWSER_RECYCLE_PAGES = 500
+
+# Smallest body worth downloading per resource type, in bytes; anything
+# declared smaller would be rejected by validate_downloaded_file anyway
+_MIN_FILE_SIZES = {"images": 100}
+
+# Content types that mean a resource URL served a web page instead, e.g. an
+# error or login page; validate_downloaded_file would delete them anyway
+_HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# Singular names of resource types, for log messages
+_TYPE_NAMES = {"documents": "document", "images": "image", "videos": "video"}
+
+
+def _sanitize_filename(filename: str) -> str:
+    """
+    Replace characters not allowed in saved filenames with underscores.
+
+    Args:
+        filename: The filename to sanitize
+
+    Returns:
+        The sanitized filename
+    """
+    if filename.isascii():
+        return filename.translate(_SANITIZE_TABLE)
+    # Only the regex knows which non-ASCII characters count as word characters
+    return _SANITIZE_RE.sub("_", filename)
+
+
+def _list_files(directory: Path) -> Set[str]:
+    """
+    List the names of the entries in a directory with a single scandir.
+
+    Args:
+        directory: The directory to list
+
+    Returns:
+        The entry names
+    """
+    with os.scandir(directory) as entries:
+        return {entry.name for entry in entries}
+
+
+def _url_path(url: str) -> str:
+    """
+    Get the path of a URL without parameters on its last segment.
+
+    Gives the same path as urlparse, using the cheaper urlsplit.
+
+    Args:
+        url: The URL to take the path from
+
+    Returns:
+        The URL's path
+    """
+    path = urllib.parse.urlsplit(url).path
+    head, sep, last = path.rpartition("/")
+    if ";" in last:
+        return head + sep + last.partition(";")[0]
+    return path
+
+
+def _url_key(url: str) -> str:
+    """
+    Get a short, stable key for a URL to disambiguate saved filenames.
+
+    Unlike hash(), the key is the same across runs, so resumed crawls map a
+    URL to the same file.
+
+    Args:
+        url: The URL to derive the key from
+
+    Returns:
+        12 hex characters derived from the URL
+    """
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=6).hexdigest()
+
+
+def _content_fingerprint(html_content: str) -> bytes:
+    """
+    Fingerprint a page so near-duplicates of it can be recognized.
+
+    Pages whose text differs only in digits or whitespace get the same
+    fingerprint. Tags and their attribute values are kept as they are, so pages
+    that link or embed different things, such as /page/2 and /page/3, stay
+    distinct.
+
+    Args:
+        html_content: HTML of the page
+
+    Returns:
+        8-byte digest of the page with volatile parts removed
+    """
+    summary = _VOLATILE_TEXT_RE.sub(lambda m: m.group(1) or "", html_content)
+    return hashlib.blake2b(summary.encode("utf-8"), digest_size=8).digest()
+
 
 class GrabHandler:
     """Handler class that implements the grab command's core functionality."""
 
     def __init__(self):
         """Initialize the grab handler."""
-        self.already_visited: Set[str] = set()
-        self.to_visit: Set[str] = set()
+        self.already_visited: Union[Set[str], VisitedUrlSet] = set()
+        # Queued URLs in crawl order, so a site is walked breadth-first
+        self.to_visit: Deque[str] = deque()
+        # Canonical forms of the queued URLs, so variants aren't queued twice
+        self._queued_keys: Set[str] = set()
+        # Canonical forms of pages an earlier crawl left pending or failed on,
+        # which may already be marked visited in the persisted Bloom filter
+        self._resumed_keys: Set[str] = set()
         self.failed_urls: Set[str] = set()
+        # failed_urls.txt, appended to as URLs fail
+        self._failed_log: Optional[TextIO] = None
+        self.downloaded_urls: Set[str] = set()
+        # Directory of each resource type, and the names of the files in it
+        self._resource_dirs: Dict[str, Path] = {}
+        self._existing_files: Dict[str, Set[str]] = {}
+        self.content_fingerprints: Set[bytes] = set()
         self.resource_count = {"html": 0, "images": 0, "documents": 0, "videos": 0}
+        self._lock = threading.Lock()
         self.network_handler: Optional[NetworkHandler] = None
         self.output_path: Optional[Path] = None
         self.javascript = True
@@ -36,8 +210,19 @@ class GrabHandler:
         self.links = True
         self.max_depth = 100
         self.restrict_domain = True
+        self._base_domain = ""
         self.debug = False
         self.browser_handler = None
+        self._browser_options: Dict[str, bool] = {}
+        self._thread_browsers = threading.local()
+        self._idle_browsers: List[BrowserAutomation] = []
+        self._all_browsers: List[BrowserAutomation] = []
+        self.aria2_downloader = None
+        self.parse_processes = 0
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._download_pool: Optional[ThreadPoolExecutor] = None
+        # Set when the crawl is interrupted, so workers stop taking on work
+        self._stop = threading.Event()
 
     def setup(
         self,
@@ -58,6 +243,11 @@ class GrabHandler:
         max_depth: int = 1,
         restrict_domain: bool = True,
         debug: bool = False,
+        aria2: bool = False,
+        parse_processes: int = 0,
+        bloom_capacity: int = 0,
+        bloom_error_rate: float = 1e-4,
+        max_file_size: int = 0,
     ) -> None:
         """Set up the grab handler.
 
@@ -79,11 +269,23 @@ class GrabHandler:
             max_depth: Maximum depth to crawl
             restrict_domain: Whether to restrict to the same domain
             debug: Whether to enable debug logging
+            aria2: Whether to download page resources in batches with aria2c
+            parse_processes: Number of worker processes for parsing pages,
+                or 0 to parse in the crawl threads
+            bloom_capacity: Number of URLs to size the visited-URL Bloom filter
+                for, or 0 to track visited URLs in an exact set
+            bloom_error_rate: False positive rate of the Bloom filter
+            max_file_size: Skip resources declared larger than this many bytes,
+                or 0 for no limit
         """
         # Reset state
         self.already_visited = set()
-        self.to_visit = set([url])
+        self.to_visit = deque([url])
+        self._queued_keys = {BrowserAutomation.canonicalize_url(url)}
+        self._resumed_keys = set()
         self.failed_urls = set()
+        self.downloaded_urls = set()
+        self.content_fingerprints = set()
         self.resource_count = {
             "html": 0,
             "images": 0,
@@ -98,16 +300,18 @@ class GrabHandler:
 
                 logger.info("Using Tor for network requests")
                 self.network_handler = TorHandler(
-                    user_agent=user_agent, timeout=timeout
+                    user_agent=user_agent,
+                    timeout=timeout,
+                    delay_between_requests=delay,
                 )
             except ImportError:
                 logger.warning(
                     "Tor support not available, falling back to standard requests"
                 )
-                from web_grabber.lib.network.base import NetworkHandler
-
                 self.network_handler = NetworkHandler(
-                    user_agent=user_agent, timeout=timeout
+                    user_agent=user_agent,
+                    timeout=timeout,
+                    delay_between_requests=delay,
                 )
         elif httpx:
             try:
@@ -115,25 +319,109 @@ class GrabHandler:
 
                 logger.info("Using httpx for network requests")
                 self.network_handler = HttpxHandler(
-                    user_agent=user_agent, timeout=timeout
+                    user_agent=user_agent,
+                    timeout=timeout,
+                    delay_between_requests=delay,
                 )
             except ImportError:
                 logger.warning("httpx not available, falling back to standard requests")
-                from web_grabber.lib.network.base import NetworkHandler
-
                 self.network_handler = NetworkHandler(
-                    user_agent=user_agent, timeout=timeout
+                    user_agent=user_agent,
+                    timeout=timeout,
+                    delay_between_requests=delay,
                 )
         else:
-            from web_grabber.lib.network.base import NetworkHandler
-
             logger.info("Using standard requests for network requests")
             self.network_handler = NetworkHandler(
-                user_agent=user_agent, timeout=timeout
+                user_agent=user_agent, timeout=timeout, delay_between_requests=delay
             )
 
+        self.network_handler.max_file_size = max_file_size
+
+        # Optionally hand resource downloads to an external aria2c process
+        self.aria2_downloader = None
+        if aria2:
+            from web_grabber.lib.network.aria2_handler import (
+                ARIA2_AVAILABLE,
+                Aria2Downloader,
+            )
+
+            if tor:
+                logger.warning(
+                    "aria2c can't route through Tor, downloading resources in-process"
+                )
+            elif not ARIA2_AVAILABLE:
+                logger.warning("aria2c not found, downloading resources in-process")
+            else:
+                logger.info("Using aria2c for resource downloads")
+                self.aria2_downloader = Aria2Downloader(
+                    user_agent=user_agent, timeout=timeout
+                )
+
         # Set up browser automation for JavaScript content
-        self.browser_handler = None
+        self._browser_options = {"camoufox": camoufox, "selenium": selenium, "tor": tor}
+        self._thread_browsers = threading.local()
+        self._idle_browsers = []
+        self._all_browsers = []
+        self.browser_handler = self._create_browser()
+        if self.browser_handler:
+            # Let the first worker thread reuse the browser started here
+            self._idle_browsers.append(self.browser_handler)
+            self._all_browsers.append(self.browser_handler)
+
+        # Set options
+        self.url = url
+        self.output_path = Path(output_dir)
+        self.javascript = javascript
+        self.scroll = scroll
+        self.resources = resources
+        self.links = links
+        self.max_depth = max_depth
+        self.restrict_domain = restrict_domain
+        # Domain of the start URL, which restricted crawls stay on
+        self._base_domain = NetworkHandler.extract_domain(url)
+        self.debug = debug
+        self.delay = delay
+        self.parse_processes = parse_processes
+
+        # Create output directories
+        self._create_output_dirs()
+
+        # A Bloom filter keeps memory flat on huge crawls, at the cost of
+        # occasionally skipping a page it wrongly thinks it has seen. It's kept
+        # in the output directory, so an interrupted crawl can be resumed.
+        if bloom_capacity > 0:
+            self.already_visited = VisitedUrlSet(
+                bloom_capacity,
+                bloom_error_rate,
+                path=self.output_path / "visited.bloom",
+                reset=not retry_failed,
+            )
+
+        # Load failed URLs and resume the previous crawl if retry_failed is True
+        if retry_failed:
+            self._load_failed_urls()
+            self._load_pending_urls()
+
+        # Record failures as they happen, so they survive an interrupted crawl.
+        # Line buffering puts each one on disk without holding up the crawl.
+        # Earlier failures are queued again above, so the log starts over and
+        # only lists the ones that still fail.
+        self._failed_log = open(self.output_path / "failed_urls.txt", "w", buffering=1)
+
+    def _create_browser(self) -> Optional[BrowserAutomation]:
+        """
+        Start a browser for the configured automation backend.
+
+        Returns:
+            The started browser, or None if no browser automation was requested
+            or no browser could be started
+        """
+        camoufox = self._browser_options["camoufox"]
+        selenium = self._browser_options["selenium"]
+        tor = self._browser_options["tor"]
+
+        browser = None
         if camoufox:
             try:
                 from web_grabber.lib.browser_automation.camoufox_handler.camoufox_handler import (
@@ -141,7 +429,7 @@ class GrabHandler:
                 )
 
                 logger.info("Setting up Camoufox browser for JavaScript content")
-                self.browser_handler = CamoufoxBrowser(headless=True, tor_proxy=tor)
+                browser = CamoufoxBrowser(headless=True, tor_proxy=tor)
                 logger.info("Using Camoufox browser for JavaScript content")
             except (ImportError, RuntimeError) as e:
                 logger.warning(f"Could not initialize Camoufox browser: {e}")
@@ -151,10 +439,10 @@ class GrabHandler:
                     )
 
                     logger.info("Falling back to standard browser")
-                    self.browser_handler = BrowserAutomation()
+                    browser = BrowserAutomation()
                 except Exception as e2:
                     logger.error(f"Could not initialize standard browser either: {e2}")
-                    self.browser_handler = None
+                    browser = None
         elif selenium:
             try:
                 from web_grabber.lib.browser_automation.selenium_handler.selenium_handler import (
@@ -162,7 +450,7 @@ class GrabHandler:
                 )
 
                 logger.info("Setting up Selenium browser for JavaScript content")
-                self.browser_handler = SeleniumBrowser(headless=True, tor_proxy=tor)
+                browser = SeleniumBrowser(headless=True, tor_proxy=tor)
                 logger.info("Using Selenium browser for JavaScript content")
             except Exception as e:
                 logger.warning(f"Could not initialize Selenium browser: {e}")
@@ -172,43 +460,121 @@ class GrabHandler:
                     )
 
                     logger.info("Falling back to standard browser")
-                    self.browser_handler = BrowserAutomation()
+                    browser = BrowserAutomation()
                 except Exception as e2:
                     logger.error(f"Could not initialize standard browser either: {e2}")
-                    self.browser_handler = None
+                    browser = None
 
-        # Set options
-        self.url = url
-        self.output_path = Path(output_dir)
-        self.javascript = javascript
-        self.scroll = scroll
-        self.resources = resources
-        self.links = links
-        self.max_depth = max_depth
-        self.restrict_domain = restrict_domain
-        self.debug = debug
-        self.delay = delay
+        return browser
 
-        # Create output directories
-        self._create_output_dirs()
+    def _get_browser(self) -> Optional[BrowserAutomation]:
+        """
+        Get the browser owned by the current worker thread.
 
-        # Load failed URLs if retry_failed is True
-        if retry_failed:
-            self._load_failed_urls()
+        Browser drivers aren't thread-safe, so each worker thread starts its own
+        browser once and reuses it for every page it processes, restarting it
+        every _BROWSER_RECYCLE_PAGES pages.
 
-    def _load_failed_urls(self) -> None:
-        """Load previously failed URLs from file."""
-        failed_urls_file = Path(self.output_path) / "failed_urls.txt"
-        if failed_urls_file.exists():
+        Returns:
+            The browser for this thread, or None if none could be started
+        """
+        browser = getattr(self._thread_browsers, "browser", None)
+        pages_served = getattr(self._thread_browsers, "pages_served", 0)
+        if browser is not None and pages_served >= _BROWSER_RECYCLE_PAGES:
+            logger.debug(f"Restarting browser after {pages_served} pages")
+            self._retire_browser(browser)
+            browser = None
+
+        if browser is None:
+            with self._lock:
+                browser = self._idle_browsers.pop() if self._idle_browsers else None
+
+            if browser is None:
+                browser = self._create_browser()
+                if browser:
+                    with self._lock:
+                        self._all_browsers.append(browser)
+
+            self._thread_browsers.browser = browser
+            pages_served = 0
+
+        self._thread_browsers.pages_served = pages_served + 1
+        return browser
+
+    def _retire_browser(self, browser: BrowserAutomation) -> None:
+        """
+        Close a browser and stop tracking it.
+
+        Args:
+            browser: Browser owned by the current worker thread
+        """
+        with self._lock:
+            self._all_browsers.remove(browser)
+
+        close = getattr(browser, "close", None)
+        if close:
             try:
-                with open(failed_urls_file, "r") as f:
-                    for line in f:
-                        url = line.strip()
-                        if url:
-                            self.failed_urls.add(url)
-                logger.info(f"Loaded {len(self.failed_urls)} failed URLs")
+                close()
             except Exception as e:
-                logger.error(f"Error loading failed URLs: {e}")
+                logger.warning(f"Error closing browser: {e}")
+
+    def _close_browsers(self) -> None:
+        """Close every browser started for the crawl."""
+        for browser in self._all_browsers:
+            close = getattr(browser, "close", None)
+            if close:
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"Error closing browser: {e}")
+
+        self._idle_browsers = []
+        self._all_browsers = []
+
+    def _load_failed_urls(self) -> None:
+        """Queue the URLs that failed in the previous crawl to be tried again."""
+        count = self._queue_resumed_urls(self.output_path / "failed_urls.txt")
+        if count:
+            logger.info(f"Retrying {count} previously failed URLs")
+
+    def _load_pending_urls(self) -> None:
+        """Queue the URLs an interrupted crawl left unprocessed."""
+        count = self._queue_resumed_urls(self.output_path / "pending_urls.txt")
+        if count:
+            logger.info(f"Resuming with {count} pending URLs")
+
+    def _queue_resumed_urls(self, urls_file: Path) -> int:
+        """
+        Queue the URLs listed in a file left by an earlier crawl.
+
+        The persisted Bloom filter may already count them as visited, so each
+        gets past the visited check once.
+
+        Args:
+            urls_file: File with one URL per line
+
+        Returns:
+            int: Number of URLs read from the file
+        """
+        if not urls_file.exists():
+            return 0
+
+        count = 0
+        try:
+            with open(urls_file, "r") as f:
+                for line in f:
+                    url = line.strip()
+                    if not url:
+                        continue
+                    key = BrowserAutomation.canonicalize_url(url)
+                    if key not in self._queued_keys:
+                        self.to_visit.append(url)
+                        self._queued_keys.add(key)
+                    self._resumed_keys.add(key)
+                    count += 1
+        except Exception as e:
+            logger.error(f"Error loading URLs from {urls_file}: {e}")
+        return count
 
     def _should_process_url(self, url: str) -> bool:
         """
@@ -221,7 +587,7 @@ class GrabHandler:
             bool: True if the URL should be processed, False otherwise
         """
         # Skip empty or invalid URLs
-        if not url or not url.startswith(("http://", "https://")):
+        if not url or not url.startswith(_SCHEMES):
             return False
 
         # Skip already visited URLs
@@ -229,213 +595,341 @@ class GrabHandler:
             return False
 
         # Skip if we've hit the max depth (only for links from pages we've already visited)
+        if self.max_depth and len(self.already_visited) >= self.max_depth:
+            return False
+
+        # Skip URLs not in our allowed domains (if we have a restriction)
         if (
-            hasattr(self, "max_depth")
-            and self.max_depth
-            and len(self.already_visited) >= self.max_depth
+            self.restrict_domain
+            and NetworkHandler.extract_domain(url) != self._base_domain
         ):
             return False
 
-        # Skip URLs not in our allowed domains (if we have a restriction)
-        if hasattr(self, "restrict_domain") and self.restrict_domain:
-            from web_grabber.lib.network.base import NetworkHandler
+        return True
 
-            initial_url = list(self.to_visit)[0] if self.to_visit else None
-            if initial_url:
-                domain = NetworkHandler.extract_domain(url)
-                base_domain = NetworkHandler.extract_domain(initial_url)
-                if domain != base_domain:
-                    return False
+    def _prepare_download(
+        self, url: str, resource_type: str, verified: bool = False
+    ) -> Tuple[str, Optional[Path]]:
+        """
+        Work out where a resource should be saved.
 
-        return True
+        Args:
+            url: URL to download
+            resource_type: Type of resource (html, images, documents, videos)
+            verified: Whether resource_type already is the URL's detected type
+
+        Returns:
+            Tuple of the (possibly corrected) resource type and the target path,
+            or None as the path if the file was already downloaded
+        """
+        # Skip URLs already saved during this crawl without touching the disk
+        with self._lock:
+            if url in self.downloaded_urls:
+                return resource_type, None
+
+        # Verify resource type again - it's possible that the initial detection was wrong
+        if verified:
+            detected_type = resource_type
+        else:
+            detected_type = BrowserAutomation.get_file_type(url)
+
+        # If the detected type doesn't match the requested type, use the detected type
+        # This prevents HTML being downloaded as PDF, etc.
+        if detected_type != resource_type and detected_type != "skip":
+            logger.warning(
+                f"Changing resource type from {resource_type} to {detected_type} for {url}"
+            )
+            resource_type = detected_type
+
+        # The standard directories were created by _create_output_dirs, so
+        # only the first file of an unexpected type costs a mkdir
+        resource_dir = self._resource_dirs.get(resource_type)
+        if resource_dir is None:
+            # Other resources go to /files/{resource_type}
+            resource_dir = self.output_path / "files" / resource_type
+            resource_dir.mkdir(parents=True, exist_ok=True)
+            self._resource_dirs[resource_type] = resource_dir
+
+        # Get file name from URL, fallback to hash if not available
+        filename = os.path.basename(_url_path(url))
+
+        # If filename is empty or has no extension, create one
+        if not filename or "." not in filename:
+            url_hash = _url_key(url)
+            ext = _DEFAULT_EXTS.get(resource_type, ".html")
+            filename = f"{url_hash}{ext}"
+        else:
+            # Fix the extension if it doesn't match the resource type
+            _, ext = os.path.splitext(filename)
+            allowed = _RESOURCE_EXTS.get(resource_type)
+            if allowed is not None and ext.lower() not in allowed:
+                filename = filename.partition(".")[0] + _DEFAULT_EXTS[resource_type]
+
+        # Sanitize filename
+        filename = _sanitize_filename(filename)
+
+        file_path = resource_dir / filename
+
+        # Don't redownload if file exists. The directories are listed once
+        # instead of calling stat() for every resource.
+        with self._lock:
+            existing = self._existing_files.get(resource_type)
+            if existing is None:
+                existing = self._existing_files[resource_type] = _list_files(
+                    resource_dir
+                )
+            exists = filename in existing
+            if exists:
+                self.downloaded_urls.add(url)
+
+        if exists:
+            # Lazy formatting: this runs per resource and debug is usually off
+            logger.debug("File already exists: %s", file_path)
+            return resource_type, None
+
+        return resource_type, file_path
+
+    @staticmethod
+    def _reject_types(resource_type: str) -> Tuple[str, ...]:
+        """
+        Get the Content-Types a resource of the given type must not have.
+
+        Args:
+            resource_type: Type of resource (html, images, documents, videos)
+
+        Returns:
+            Content-Type prefixes to skip the download for
+        """
+        return () if resource_type == "html" else _HTML_CONTENT_TYPES
+
+    def _finish_download(
+        self, url: str, resource_type: str, file_path: Path, success: bool
+    ) -> bool:
+        """
+        Validate and record a finished download.
+
+        Args:
+            url: URL that was downloaded
+            resource_type: Type of resource (html, images, documents, videos)
+            file_path: Path the resource was saved to
+            success: Whether the network handler reported success
+
+        Returns:
+            True if download was successful, False otherwise
+        """
+        # Special handling for HTML-like content
+        if success and resource_type == "html" and file_path.suffix.lower() != ".html":
+            # If we saved HTML content with a non-HTML extension, fix it
+            new_path = file_path.with_suffix(".html")
+            os.rename(file_path, new_path)
+            file_path = new_path
+
+        # Verify the file was downloaded correctly, with one stat for both
+        # whether it exists and its size
+        try:
+            file_size = os.stat(file_path).st_size
+        except FileNotFoundError:
+            file_size = None
+        if file_size is not None:
+            # Validate file using BrowserAutomation helper
+            valid = BrowserAutomation.validate_downloaded_file(
+                file_path, resource_type, url, file_size
+            )
+            if not valid:
+                self._record_failure(url)
+                return False
+
+        if success:
+            with self._lock:
+                self.downloaded_urls.add(url)
+                self._existing_files.setdefault(resource_type, set()).add(
+                    file_path.name
+                )
+                # += isn't atomic, so concurrent downloads could lose counts
+                self.resource_count[resource_type] += 1
+            logger.info(f"Downloaded {resource_type}: {url} -> {file_path}")
+            return True
+        else:
+            self._record_failure(url)
+            return False
 
-    def download_file(self, url: str, resource_type: str) -> bool:
+    def download_file(
+        self, url: str, resource_type: str, verified: bool = False
+    ) -> bool:
         """
         Download a file from URL to output directory.
 
         Args:
             url: URL to download
             resource_type: Type of resource (html, images, documents, videos)
+            verified: Whether resource_type already is the URL's detected type
 
         Returns:
             True if download was successful, False otherwise
         """
         if not self.output_path or not self.network_handler:
             logger.error("Setup not completed before download")
-            self.failed_urls.add(url)
+            self._record_failure(url)
             return False
 
         try:
-            # Verify resource type again - it's possible that the initial detection was wrong
-            detected_type = BrowserAutomation.get_file_type(url)
+            resource_type, file_path = self._prepare_download(
+                url, resource_type, verified
+            )
+            if file_path is None:
+                return True
 
-            # If the detected type doesn't match the requested type, use the detected type
-            # This prevents HTML being downloaded as PDF, etc.
-            if detected_type != resource_type and detected_type != "skip":
-                logger.warning(
-                    f"Changing resource type from {resource_type} to {detected_type} for {url}"
-                )
-                resource_type = detected_type
+            # Download the file
+            success = self.network_handler.download_file(
+                url,
+                str(file_path),
+                min_size=_MIN_FILE_SIZES.get(resource_type, 0),
+                reject_types=self._reject_types(resource_type),
+            )
+            return self._finish_download(url, resource_type, file_path, success)
+        except Exception as e:
+            logger.error(f"Failed to download {url}: {e}")
+            self._record_failure(url)
+            return False
 
-            # Handle file organization based on resource type
-            if resource_type == "html":
-                # HTML files stay in /html
-                resource_dir = self.output_path / "html"
-            else:
-                # Other resources go to /files/{resource_type}
-                resource_dir = self.output_path / "files" / resource_type
+    async def download_file_async(
+        self, url: str, resource_type: str, verified: bool = False
+    ) -> bool:
+        """
+        Download a file from URL to output directory using the async client.
 
-            # Ensure directory exists
-            resource_dir.mkdir(parents=True, exist_ok=True)
+        Args:
+            url: URL to download
+            resource_type: Type of resource (html, images, documents, videos)
+            verified: Whether resource_type already is the URL's detected type
 
-            # Get file name from URL, fallback to hash if not available
-            parsed_url = urllib.parse.urlparse(url)
-            filename = os.path.basename(parsed_url.path)
-
-            # If filename is empty or has no extension, create one
-            if not filename or "." not in filename:
-                url_hash = abs(hash(url)) % 10000
-                ext = (
-                    ".jpg"
-                    if resource_type == "images"
-                    else ".mp4"
-                    if resource_type == "videos"
-                    else ".pdf"
-                    if resource_type == "documents"
-                    else ".html"
-                )
-                filename = f"{url_hash}{ext}"
-            else:
-                # Check if the extension matches the resource type
-                _, ext = os.path.splitext(filename)
-                if resource_type == "images" and ext.lower() not in [
-                    ".jpg",
-                    ".jpeg",
-                    ".png",
-                    ".gif",
-                    ".svg",
-                    ".webp",
-                    ".bmp",
-                    ".ico",
-                ]:
-                    # Fix extension for images
-                    filename = f"{filename.split('.')[0]}.jpg"
-                elif resource_type == "videos" and ext.lower() not in [
-                    ".mp4",
-                    ".webm",
-                    ".avi",
-                    ".mov",
-                    ".wmv",
-                    ".flv",
-                    ".mkv",
-                ]:
-                    # Fix extension for videos
-                    filename = f"{filename.split('.')[0]}.mp4"
-                elif resource_type == "documents" and ext.lower() not in [
-                    ".pdf",
-                    ".doc",
-                    ".docx",
-                    ".xls",
-                    ".xlsx",
-                    ".txt",
-                ]:
-                    # Fix extension for documents
-                    filename = f"{filename.split('.')[0]}.pdf"
-
-            # Sanitize filename
-            filename = re.sub(r"[^\w\-.]", "_", filename)
-
-            file_path = resource_dir / filename
-
-            # Don't redownload if file exists
-            if file_path.exists():
-                logger.debug(f"File already exists: {file_path}")
+        Returns:
+            True if download was successful, False otherwise
+        """
+        if not self.output_path or not self.network_handler:
+            logger.error("Setup not completed before download")
+            self._record_failure(url)
+            return False
+
+        try:
+            resource_type, file_path = self._prepare_download(
+                url, resource_type, verified
+            )
+            if file_path is None:
                 return True
 
             # Download the file
-            success = self.network_handler.download_file(url, str(file_path))
-
-            # Special handling for HTML-like content
-            if (
-                success
-                and resource_type == "html"
-                and file_path.suffix.lower() != ".html"
-            ):
-                # If we saved HTML content with a non-HTML extension, fix it
-                new_path = file_path.with_suffix(".html")
-                os.rename(file_path, new_path)
-                file_path = new_path
-
-            # Verify the file was downloaded correctly
-            if os.path.exists(file_path):
-                # Validate file using BrowserAutomation helper
-                valid = BrowserAutomation.validate_downloaded_file(
-                    file_path, resource_type, url
+            async with self._request_slots:
+                success = await self.network_handler.async_download_file(
+                    url,
+                    str(file_path),
+                    min_size=_MIN_FILE_SIZES.get(resource_type, 0),
+                    reject_types=self._reject_types(resource_type),
                 )
-                if not valid:
-                    self.failed_urls.add(url)
-                    return False
-
-            if success:
-                self.resource_count[resource_type] += 1
-                logger.info(f"Downloaded {resource_type}: {url} -> {file_path}")
-                return True
-            else:
-                self.failed_urls.add(url)
-                return False
+            return self._finish_download(url, resource_type, file_path, success)
         except Exception as e:
             logger.error(f"Failed to download {url}: {e}")
-            self.failed_urls.add(url)
+            self._record_failure(url)
             return False
 
+    def _claim_page(self, url: str) -> bool:
+        """
+        Mark a page as visited if it should be processed.
+
+        Args:
+            url: URL to check
+
+        Returns:
+            bool: True if the caller should process the page, False otherwise
+        """
+        # Visited pages are keyed on their canonical URL so variants of the
+        # same page (fragments, tracking params, trailing slash) are fetched once
+        key = BrowserAutomation.canonicalize_url(url)
+
+        # Check and mark atomically so two workers never fetch the same page.
+        # Pages an earlier crawl left pending or failed on were claimed by it,
+        # so they get past the visited check once.
+        with self._lock:
+            if key in self._resumed_keys:
+                self._resumed_keys.discard(key)
+                should_process = True
+            else:
+                should_process = self._should_process_url(key)
+            if should_process:
+                self.already_visited.add(key)
+
+        if not should_process:
+            logger.info(f"Skipping URL: {url}")
+            return False
+
+        logger.info(f"Processing URL: {url}")
+        return True
+
     def process_page(self, url: str) -> None:
         """Process a web page and extract resources.
 
         Args:
             url: URL to process
         """
-        if not self._should_process_url(url):
-            logger.info(f"Skipping URL: {url}")
+        if self._stop.is_set() or not self._claim_page(url):
             return
 
-        logger.info(f"Processing URL: {url}")
-        self.already_visited.add(url)
-
         try:
             # Get page content and resources using browser handler if available, otherwise use network handler
-            if self.browser_handler and (self.javascript or self.scroll):
-                html_content, resources = self.browser_handler.get_page_content(
+            browser = (
+                self._get_browser()
+                if self.browser_handler and (self.javascript or self.scroll)
+                else None
+            )
+            page_links = None
+            if browser:
+                # Browsers fetch pages themselves, outside the network handler
+                self.network_handler.rate_limiter.acquire(url)
+                html_content, resources = browser.get_page_content(
                     url, wait_for_js=self.javascript, scroll=self.scroll
                 )
+                # Browsers only hand back text
+                body = html_content
                 logger.debug("Retrieved content using browser automation")
             else:
-                html_content, resources = self.network_handler.get_page_content(
-                    url, wait_for_js=self.javascript, scroll=self.scroll
-                )
+                html_content, body = self.network_handler.fetch_page(url)
+                if not html_content:
+                    page_links, resources = [], {}
+                elif self._parse_pool:
+                    page_links, resources = self._parse_pool.submit(
+                        BrowserAutomation.extract_all, url, html_content
+                    ).result()
+                else:
+                    page_links, resources = BrowserAutomation.extract_all(
+                        url, html_content
+                    )
                 logger.debug("Retrieved content using network handler")
 
             # First determine if the URL itself is a resource
-            url_resource_type = self.network_handler.get_file_type(url)
+            url_resource_type = BrowserAutomation.get_file_type(url)
             if url_resource_type != "html" and url_resource_type != "skip":
                 logger.info(
                     f"URL {url} is a {url_resource_type} resource, downloading directly"
                 )
-                self.download_file(url, url_resource_type)
+                self.download_file(url, url_resource_type, verified=True)
                 return
 
             # Only save HTML if content was retrieved successfully
             if html_content:
                 # Validate HTML content before saving
                 if self._is_valid_html(html_content):
-                    self._save_html_content(url, html_content)
+                    # Only the copy is skipped; its links and resources may
+                    # still lead somewhere its twin's don't
+                    if not self._is_duplicate_content(url, html_content):
+                        self._save_html_content(url, html_content)
                 else:
                     # If not valid HTML, it's likely a file, try to download directly
                     logger.info(
                         f"Content from {url} is not valid HTML, attempting direct download"
                     )
-                    direct_type = self._detect_content_type(html_content)
+                    direct_type = self._detect_content_type(body)
                     if direct_type != "html":
-                        self.download_file(url, direct_type)
+                        self.download_file(url, direct_type, verified=True)
                     else:
                         # Save it as HTML but log a warning
                         logger.warning(
@@ -443,7 +937,9 @@ class GrabHandler:
                         )
                         self._save_html_content(url, html_content)
             else:
+                # Record it, so --retry-failed fetches it again
                 logger.warning(f"No HTML content retrieved from: {url}")
+                self._record_failure(url)
 
             # Process resources if requested
             if self.resources:
@@ -451,8 +947,9 @@ class GrabHandler:
 
             # Process links if requested
             if self.links:
-                links = BrowserAutomation.get_page_links(url, html_content)
-                self._process_links(url, links)
+                if page_links is None:
+                    page_links = BrowserAutomation.get_page_links(url, html_content)
+                self._process_links(url, page_links)
 
         except Exception as e:
             logger.error(f"Error processing URL {url}: {e}")
@@ -460,7 +957,109 @@ class GrabHandler:
                 import traceback
 
                 logger.debug(traceback.format_exc())
-            self.failed_urls.add(url)
+            self._record_failure(url)
+
+    async def process_page_async(self, url: str) -> None:
+        """Process a web page using the async client of the httpx handler.
+
+        Args:
+            url: URL to process
+        """
+        if not self._claim_page(url):
+            return
+
+        try:
+            async with self._request_slots:
+                html_content, body = await self.network_handler.async_fetch_page(url)
+            if not html_content:
+                page_links, resources = [], {}
+            elif self._parse_pool:
+                loop = asyncio.get_running_loop()
+                page_links, resources = await loop.run_in_executor(
+                    self._parse_pool, BrowserAutomation.extract_all, url, html_content
+                )
+            else:
+                page_links, resources = BrowserAutomation.extract_all(url, html_content)
+            logger.debug("Retrieved content using async network handler")
+
+            # First determine if the URL itself is a resource
+            url_resource_type = BrowserAutomation.get_file_type(url)
+            if url_resource_type != "html" and url_resource_type != "skip":
+                logger.info(
+                    f"URL {url} is a {url_resource_type} resource, downloading directly"
+                )
+                await self.download_file_async(url, url_resource_type, verified=True)
+                return
+
+            # Only save HTML if content was retrieved successfully
+            if html_content:
+                # Validate HTML content before saving
+                if self._is_valid_html(html_content):
+                    # Only the copy is skipped; its links and resources may
+                    # still lead somewhere its twin's don't
+                    if not self._is_duplicate_content(url, html_content):
+                        self._save_html_content(url, html_content)
+                else:
+                    # If not valid HTML, it's likely a file, try to download directly
+                    logger.info(
+                        f"Content from {url} is not valid HTML, attempting direct download"
+                    )
+                    direct_type = self._detect_content_type(body)
+                    if direct_type != "html":
+                        await self.download_file_async(url, direct_type, verified=True)
+                    else:
+                        # Save it as HTML but log a warning
+                        logger.warning(
+                            f"Saving content with unclear type as HTML: {url}"
+                        )
+                        self._save_html_content(url, html_content)
+            else:
+                # Record it, so --retry-failed fetches it again
+                logger.warning(f"No HTML content retrieved from: {url}")
+                self._record_failure(url)
+
+            # Process resources if requested
+            if self.resources:
+                await self._process_resources_async(url, resources)
+
+            # Process links if requested
+            if self.links:
+                if page_links is None:
+                    page_links = BrowserAutomation.get_page_links(url, html_content)
+                self._process_links(url, page_links)
+
+        except Exception as e:
+            logger.error(f"Error processing URL {url}: {e}")
+            if self.debug:
+                import traceback
+
+                logger.debug(traceback.format_exc())
+            self._record_failure(url)
+
+    def _is_duplicate_content(self, url: str, html_content: str) -> bool:
+        """
+        Check whether a page is a near-duplicate of one already crawled.
+
+        Records the page's fingerprint if it is new.
+
+        Args:
+            url: URL the content was fetched from
+            html_content: HTML of the page
+
+        Returns:
+            bool: True if an equivalent page was already processed
+        """
+        fingerprint = _content_fingerprint(html_content)
+        with self._lock:
+            if fingerprint in self.content_fingerprints:
+                duplicate = True
+            else:
+                self.content_fingerprints.add(fingerprint)
+                duplicate = False
+
+        if duplicate:
+            logger.info(f"Not saving near-duplicate page: {url}")
+        return duplicate
 
     def _save_html_content(self, url: str, html_content: str) -> None:
         """
@@ -479,7 +1078,7 @@ class GrabHandler:
             logger.warning(
                 f"URL {url} appears to be a {resource_type} file, not HTML. Handling accordingly."
             )
-            self.download_file(url, resource_type)
+            self.download_file(url, resource_type, verified=True)
             return
 
         # Check if the content appears to be binary or not actually HTML
@@ -490,75 +1089,53 @@ class GrabHandler:
             self.download_file(url, "documents")
             return
 
+        # Created up front by _create_output_dirs
         page_dir = self.output_path / "html"
-        page_dir.mkdir(exist_ok=True)
 
-        # Create filename from URL
-        parsed_url = urllib.parse.urlparse(url)
-        path_parts = parsed_url.path.strip("/").split("/")
-        if not path_parts or path_parts == [""]:
+        # Create filename from URL, using last part of path as filename, or
+        # index.html for root
+        filename = _url_path(url).strip("/").rpartition("/")[2]
+        if not filename:
             filename = "index.html"
-        else:
-            # Use last part of path as filename, or index.html for root
-            filename = path_parts[-1]
-            if not filename or "." not in filename:
-                filename = f"{filename or 'page'}.html"
+        elif "." not in filename:
+            filename = f"{filename}.html"
 
         # Check if the filename suggests this is a document or image, not HTML
         lower_filename = filename.lower()
 
-        # Check for document files
-        if any(
-            lower_filename.endswith(ext)
-            for ext in [".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx"]
-        ):
-            logger.warning(
-                f"Found document file '{filename}' in HTML path. Handling it as document."
-            )
-            self.download_file(url, "documents")
-            return
-
-        # Check for image files
-        if any(
-            lower_filename.endswith(ext)
-            for ext in [".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg"]
-        ):
+        # Check for document, image and video files
+        path_type = _PAGE_PATH_TYPES.get(os.path.splitext(lower_filename)[1])
+        if path_type:
+            name = _TYPE_NAMES[path_type]
             logger.warning(
-                f"Found image file '{filename}' in HTML path. Handling it as image."
+                f"Found {name} file '{filename}' in HTML path. Handling it as {name}."
             )
-            self.download_file(url, "images")
-            return
-
-        # Check for video files
-        if any(
-            lower_filename.endswith(ext)
-            for ext in [".mp4", ".webm", ".avi", ".mov", ".wmv", ".flv"]
-        ):
-            logger.warning(
-                f"Found video file '{filename}' in HTML path. Handling it as video."
-            )
-            self.download_file(url, "videos")
+            self.download_file(url, path_type)
             return
 
         # Ensure the filename has .html extension
-        if not lower_filename.endswith(".html") and not lower_filename.endswith(".htm"):
-            base_name = filename.split(".")[0] if "." in filename else filename
-            filename = f"{base_name}.html"
+        if not lower_filename.endswith((".html", ".htm")):
+            filename = f"{filename.partition('.')[0]}.html"
 
         # Sanitize filename
-        filename = re.sub(r"[^\w\-.]", "_", filename)
+        filename = _sanitize_filename(filename)
 
-        # Add unique identifier if needed
+        # Save HTML in a single write, without a text-mode buffering layer.
+        # Exclusive creation replaces a separate exists() check, and falls back
+        # to a unique name if another page already took this one.
+        data = html_content.encode("utf-8")
         file_path = page_dir / filename
-        if file_path.exists():
+        try:
+            with open(file_path, "xb", buffering=0) as f:
+                f.write(data)
+        except FileExistsError:
             base, ext = os.path.splitext(filename)
-            file_path = page_dir / f"{base}_{abs(hash(url)) % 10000}{ext}"
+            file_path = page_dir / f"{base}_{_url_key(url)}{ext}"
+            file_path.write_bytes(data)
 
-        # Save HTML
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-        self.resource_count["html"] += 1
+        with self._lock:
+            self._existing_files.setdefault("html", set()).add(file_path.name)
+            self.resource_count["html"] += 1
         logger.info(f"Saved HTML: {url} -> {file_path}")
 
     def _is_valid_html(self, content: str) -> bool:
@@ -571,52 +1148,33 @@ class GrabHandler:
         Returns:
             bool: True if content appears to be HTML, False otherwise
         """
-        if not content:
-            return False
-
-        # Check for PDF signature
-        if content.startswith("%PDF-"):
-            return False
-
-        # Check for common HTML markers
-        lower_content = content.lower()
-        return (
-            "<!doctype html" in lower_content[:1000]
-            or "<html" in lower_content[:1000]
-            or "<head" in lower_content[:1000]
-            or "<body" in lower_content[:1000]
-        )
+        return BrowserAutomation.looks_like_html(content)
 
-    def _detect_content_type(self, content: str) -> str:
+    def _detect_content_type(self, content: Union[str, bytes]) -> str:
         """
         Attempt to detect content type from the content itself.
 
         Args:
-            content: Content to analyze
+            content: Raw response body, or the page text from a browser
 
         Returns:
             str: Detected file type ("documents", "images", "html", etc.)
         """
-        # Check for PDF signature
-        if content.startswith("%PDF-"):
-            return "documents"
+        # Signatures are only reliable on the raw bytes; browser text can
+        # still be recognized as HTML below
+        head = content[:16]
+        if isinstance(head, str):
+            head = head.encode("utf-8")
+        else:
+            content = content[:1000].decode("latin-1")
 
-        # Check for common image signatures
-        if content.startswith(b"\xff\xd8\xff"):  # JPEG
-            return "images"
-        if content.startswith(b"\x89PNG\r\n\x1a\n"):  # PNG
-            return "images"
-        if content.startswith(b"GIF87a") or content.startswith(b"GIF89a"):  # GIF
-            return "images"
+        # Check for document and image signatures
+        for signature, file_type in _SIGNATURE_TYPES:
+            if head.startswith(signature):
+                return file_type
 
         # Check for HTML indicators
-        lower_content = content.lower()
-        if (
-            "<!doctype html" in lower_content[:1000]
-            or "<html" in lower_content[:1000]
-            or "<head" in lower_content[:1000]
-            or "<body" in lower_content[:1000]
-        ):
+        if BrowserAutomation.looks_like_html(content):
             return "html"
 
         # Default to documents for unknown types
@@ -646,48 +1204,59 @@ class GrabHandler:
             logger.error("Setup not completed before crawling")
             return
 
+        # Workers pace their own requests through the handler's shared limiter.
+        # Each host gets its own bucket, so a slow host doesn't hold up the
+        # others, and may take up to `threads` requests at once after idling.
+        self.network_handler.rate_limiter.configure(delay, burst=threads)
+
+        # Parse pages in worker processes so large documents don't hold the GIL
+        # that fetching threads need. Spawned workers avoid forking a
+        # multi-threaded process.
+        if self.parse_processes > 0:
+            logger.info(f"Parsing pages in {self.parse_processes} worker processes")
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
         # Start crawling
-        logger.info(f"Starting crawl with {threads} threads")
         start_time = time.time()
+        self._stop.clear()
 
-        try:
-            with ThreadPoolExecutor(max_workers=threads) as executor:
-                futures = []
-
-                while self.to_visit:
-                    batch = set()
-                    for _ in range(min(threads * 2, len(self.to_visit))):
-                        if not self.to_visit:
-                            break
-                        batch.add(self.to_visit.pop())
-
-                    for page_url in batch:
-                        futures.append(
-                            executor.submit(
-                                self.process_page,
-                                page_url,
-                            )
-                        )
-
-                    # Wait for the current batch to complete
-                    for future in futures:
-                        try:
-                            future.result()
-                        except Exception as e:
-                            logger.error(f"Error in thread: {e}")
+        # Resolve each host once rather than for every new connection. Tor
+        # resolves names at the exit node, so there is nothing to cache.
+        dns_cache = DnsCache()
+        if not isinstance(self.network_handler, TorHandler):
+            dns_cache.install()
 
-                    futures = []
-
-                    # Sleep to avoid overloading the server
-                    time.sleep(delay)
+        try:
+            # Plain HTTP crawls don't need a thread per request
+            if (
+                use_httpx
+                and not use_selenium
+                and not use_camoufox
+                and isinstance(self.network_handler, HttpxHandler)
+            ):
+                logger.info(f"Starting async crawl with {threads} concurrent pages")
+                asyncio.run(self._crawl_async(threads))
+            else:
+                logger.info(f"Starting crawl with {threads} threads")
+                self._crawl_threaded(threads)
         finally:
             # Clean up resources
+            dns_cache.uninstall()
+            if self._parse_pool:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
+            self._close_browsers()
             if self.network_handler:
                 self.network_handler.close()
                 self.network_handler = None
-
-        # Save failed URLs to a file
-        self._save_failed_urls()
+            # Keep what's needed to resume, even if the crawl was interrupted
+            if isinstance(self.already_visited, VisitedUrlSet):
+                self.already_visited.flush()
+            self._save_pending_urls()
+            self._close_failed_log()
 
         # Log summary
         elapsed_time = time.time() - start_time
@@ -700,16 +1269,162 @@ class GrabHandler:
         )
         logger.info(f"Failed URLs: {len(self.failed_urls)}")
 
-    def _save_failed_urls(self) -> None:
-        """Save failed URLs to a file."""
-        if not self.output_path or not self.failed_urls:
+    def _crawl_threaded(self, threads: int) -> None:
+        """
+        Crawl queued URLs with a pool of worker threads.
+
+        Args:
+            threads: Number of concurrent threads
+        """
+        # Page workers hand resource downloads to a pool of their own; sharing
+        # theirs could leave every page worker waiting on downloads queued
+        # behind it. Like the async crawl, allow threads * 4 requests in all.
+        download_workers = threads * 3
+        self._download_pool = ThreadPoolExecutor(
+            max_workers=download_workers, thread_name_prefix="download"
+        )
+
+        # Give every worker its own pooled connection
+        self.network_handler.set_pool_size(threads + download_workers)
+
+        try:
+            self._crawl_pages(threads)
+        finally:
+            # Drop queued downloads if the crawl was interrupted
+            stopped = self._stop.is_set()
+            self._download_pool.shutdown(wait=not stopped, cancel_futures=stopped)
+            self._download_pool = None
+
+    def _crawl_pages(self, threads: int) -> None:
+        """
+        Process queued pages with a pool of worker threads until none are left.
+
+        Args:
+            threads: Number of concurrent threads
+        """
+        executor = ThreadPoolExecutor(max_workers=threads)
+        # URL of each page being processed
+        in_flight: Dict[Future, str] = {}
+        try:
+            while self.to_visit or in_flight:
+                # Keep every worker busy instead of waiting for a whole batch
+                while self.to_visit and len(in_flight) < threads:
+                    with self._lock:
+                        url = self._pop_queued_url()
+                    in_flight[executor.submit(self.process_page, url)] = url
+
+                # Resume as soon as any page finishes; it may have queued new links
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del in_flight[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Error in thread: {e}")
+        except BaseException:
+            # On Ctrl-C, return to the caller's cleanup instead of waiting for
+            # the pages in flight; workers skip whatever they pick up next
+            self._stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._requeue_pages(
+                [url for future, url in in_flight.items() if not future.done()]
+            )
+            raise
+
+        executor.shutdown()
+
+    async def _crawl_async(self, threads: int) -> None:
+        """
+        Crawl queued URLs as coroutines sharing one pooled httpx client.
+
+        Args:
+            threads: Number of pages to process concurrently
+        """
+        # Pages and their resource downloads share the connection pool, so cap
+        # in-flight requests at the pool size rather than waiting on it
+        max_connections = threads * 4
+        self._request_slots = asyncio.Semaphore(max_connections)
+        # Stay polite: no single host sees more parallel requests than the
+        # user asked for, while other hosts (e.g. CDNs) use the rest of the pool
+        self.network_handler.open_async_client(
+            max_connections=max_connections, max_per_host=threads
+        )
+
+        # URL of each page being processed
+        in_flight: Dict[asyncio.Task, str] = {}
+        try:
+            while self.to_visit or in_flight:
+                # Keep every slot busy instead of waiting for a whole batch
+                while self.to_visit and len(in_flight) < threads:
+                    url = self._pop_queued_url()
+                    in_flight[asyncio.create_task(self.process_page_async(url))] = url
+
+                # Resume as soon as any page finishes; it may have queued new links
+                done, _ = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    del in_flight[task]
+                    try:
+                        task.result()
+                    except Exception as e:
+                        logger.error(f"Error in task: {e}")
+        except BaseException:
+            # Interrupted; the unfinished pages are cancelled with the loop
+            self._requeue_pages(
+                [url for task, url in in_flight.items() if not task.done()]
+            )
+            raise
+        finally:
+            await self.network_handler.async_close()
+
+    def _record_failure(self, url: str) -> None:
+        """
+        Record a failed URL, appending it to failed_urls.txt if it's new.
+
+        Args:
+            url: URL that failed
+        """
+        with self._lock:
+            if url in self.failed_urls:
+                return
+            self.failed_urls.add(url)
+            if self._failed_log:
+                self._failed_log.write(f"{url}\n")
+
+    def _close_failed_log(self) -> None:
+        """Close failed_urls.txt at the end of the crawl."""
+        # Abandoned workers may still be recording failures
+        with self._lock:
+            if not self._failed_log:
+                return
+
+            self._failed_log.close()
+            self._failed_log = None
+        if self.failed_urls:
+            logger.info(
+                f"Saved {len(self.failed_urls)} failed URLs to "
+                f"{self.output_path / 'failed_urls.txt'}"
+            )
+
+    def _save_pending_urls(self) -> None:
+        """Save the URLs still queued, or remove the file once none are left."""
+        if not self.output_path:
+            return
+
+        pending_urls_path = self.output_path / "pending_urls.txt"
+        # Abandoned workers may still be queueing links
+        with self._lock:
+            pending_urls = list(self.to_visit)
+
+        if not pending_urls:
+            pending_urls_path.unlink(missing_ok=True)
             return
 
-        failed_urls_path = self.output_path / "failed_urls.txt"
-        with open(failed_urls_path, "w") as f:
-            for failed_url in sorted(self.failed_urls):
-                f.write(f"{failed_url}\n")
-        logger.info(f"Saved {len(self.failed_urls)} failed URLs to {failed_urls_path}")
+        with open(pending_urls_path, "w") as f:
+            for pending_url in pending_urls:
+                f.write(f"{pending_url}\n")
+        logger.info(f"Saved {len(pending_urls)} pending URLs to {pending_urls_path}")
 
     def get_summary(self) -> Dict[str, Any]:
         """
@@ -734,25 +1449,146 @@ class GrabHandler:
             base_url: Base URL of the page
             resources: Dictionary of resource types and URLs
         """
+        claimed = []
         for resource_type, urls in resources.items():
             for url in urls:
-                try:
-                    # Skip already visited URLs
+                # Skip already visited URLs, marking new ones to avoid reprocessing
+                with self._lock:
                     if url in self.already_visited:
                         continue
+                    self.already_visited.add(url)
+                claimed.append((url, resource_type))
+
+        if self.aria2_downloader:
+            self._download_with_aria2(claimed)
+            return
+
+        if self._download_pool:
+            # Download in parallel, but don't count the page as done before
+            # its resources are
+            submit = self._download_pool.submit
+            wait(
+                [
+                    submit(self._download_resource, url, resource_type)
+                    for url, resource_type in claimed
+                ]
+            )
+            return
 
-                    # Mark as visited to avoid reprocessing
+        for url, resource_type in claimed:
+            self._download_resource(url, resource_type)
+
+    def _download_resource(self, url: str, resource_type: str) -> None:
+        """
+        Download a resource found on a page, recording it as failed on errors.
+
+        Args:
+            url: URL of the resource
+            resource_type: Type of resource (html, images, documents, videos)
+        """
+        if self._stop.is_set():
+            return
+
+        try:
+            # Download the resource
+            self.download_file(url, resource_type)
+        except Exception as e:
+            logger.error(f"Error processing resource {url}: {e}")
+            if self.debug:
+                import traceback
+
+                logger.debug(traceback.format_exc())
+            self._record_failure(url)
+
+    def _download_with_aria2(self, downloads: List[Tuple[str, str]]) -> None:
+        """
+        Download a page's resources with one aria2c run.
+
+        Args:
+            downloads: (url, resource_type) pairs to download
+        """
+        prepared = []
+        for url, resource_type in downloads:
+            try:
+                resource_type, file_path = self._prepare_download(url, resource_type)
+            except Exception as e:
+                logger.error(f"Failed to download {url}: {e}")
+                self._record_failure(url)
+                continue
+            if file_path is not None:
+                prepared.append((url, resource_type, file_path))
+
+        if not prepared:
+            return
+
+        results = self.aria2_downloader.download_batch(
+            [(url, file_path) for url, _, file_path in prepared]
+        )
+        for (url, resource_type, file_path), success in zip(prepared, results):
+            self._finish_download(url, resource_type, file_path, success)
+
+    async def _process_resources_async(
+        self, base_url: str, resources: Dict[str, List[str]]
+    ) -> None:
+        """
+        Download resources from a page concurrently using the async client.
+
+        Args:
+            base_url: Base URL of the page
+            resources: Dictionary of resource types and URLs
+        """
+        claimed = []
+        for resource_type, urls in resources.items():
+            for url in urls:
+                # Skip already visited URLs, marking new ones to avoid reprocessing
+                with self._lock:
+                    if url in self.already_visited:
+                        continue
                     self.already_visited.add(url)
+                claimed.append((url, resource_type))
 
-                    # Download the resource
-                    self.download_file(url, resource_type)
-                except Exception as e:
-                    logger.error(f"Error processing resource {url}: {e}")
-                    if self.debug:
-                        import traceback
+        if self.aria2_downloader:
+            # aria2c blocks until the batch is done, so keep it off the loop
+            await asyncio.to_thread(self._download_with_aria2, claimed)
+            return
 
-                        logger.debug(traceback.format_exc())
-                    self.failed_urls.add(url)
+        downloads = [
+            self.download_file_async(url, resource_type)
+            for url, resource_type in claimed
+        ]
+
+        # download_file_async handles its own errors
+        await asyncio.gather(*downloads)
+
+    def _pop_queued_url(self) -> str:
+        """
+        Take the next URL off the queue.
+
+        Callers must hold self._lock while worker threads can queue links.
+
+        Returns:
+            str: The URL to process next
+        """
+        url = self.to_visit.popleft()
+        self._queued_keys.discard(BrowserAutomation.canonicalize_url(url))
+        return url
+
+    def _requeue_pages(self, urls: List[str]) -> None:
+        """
+        Put pages taken off the queue back at its front, in their old order.
+
+        Used when the crawl is interrupted before they finish, so they are
+        saved as pending and processed again on resume.
+
+        Args:
+            urls: URLs of the unfinished pages, in the order they were taken
+        """
+        with self._lock:
+            for url in reversed(urls):
+                key = BrowserAutomation.canonicalize_url(url)
+                if key not in self._queued_keys:
+                    self.to_visit.appendleft(url)
+                    self._queued_keys.add(key)
 
     def _process_links(self, base_url: str, links: List[str]) -> None:
         """
@@ -762,15 +1598,23 @@ class GrabHandler:
             base_url: Base URL of the page
             links: List of links found on the page
         """
-        for link in links:
-            # Skip already visited or queued links
-            if link in self.already_visited or link in self.to_visit:
-                continue
-
-            # Check if the link should be processed
-            if self._should_process_url(link):
-                # Add to queue for processing
-                self.to_visit.add(link)
+        # Canonicalize once, outside the lock; recurring links hit the cache
+        candidates = [
+            (link, BrowserAutomation.canonicalize_url(link)) for link in links
+        ]
+
+        # Workers share the queue and the visited set, so update them atomically
+        with self._lock:
+            for link, key in candidates:
+                # Skip already queued or visited links before the costlier checks
+                if key in self._queued_keys or key in self.already_visited:
+                    continue
+
+                # Check if the link should be processed
+                if self._should_process_url(link):
+                    # Add to queue for processing
+                    self.to_visit.append(link)
+                    self._queued_keys.add(key)
 
     def _create_output_dirs(self) -> None:
         """Create the output directories for different resource types."""
@@ -785,3 +1629,15 @@ class GrabHandler:
         (files_dir / "images").mkdir(exist_ok=True)
         (files_dir / "documents").mkdir(exist_ok=True)
         (files_dir / "videos").mkdir(exist_ok=True)
+
+        # HTML files stay in /html, other resources go to /files/{resource_type}
+        self._resource_dirs = {"html": self.output_path / "html"}
+        for resource_type in ("images", "documents", "videos"):
+            self._resource_dirs[resource_type] = files_dir / resource_type
+
+        # Take stock of files from earlier crawls, so downloads can skip them
+        # without a stat() each
+        self._existing_files = {
+            resource_type: _list_files(resource_dir)
+            for resource_type, resource_dir in self._resource_dirs.items()
+        }
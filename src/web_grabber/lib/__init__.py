@@ -1,20 +1,7 @@
 """Library components for web-grabber."""
 
-from web_grabber.lib.browser_automation import (
-    BrowserAutomation,
-    CamoufoxBrowser,
-    SeleniumBrowser,
-)
-from web_grabber.lib.browser_automation.camoufox_handler.camoufox_handler import (
-    get_camoufox_session,
-)
-
-# Legacy compatibility imports for backward compatibility
-from web_grabber.lib.browser_automation.selenium_handler.selenium_handler import (
-    close_selenium_session,
-    get_page_content,
-    get_selenium_session,
-)
+from web_grabber._lazy import make_lazy_getattr
+from web_grabber.lib.browser_automation import BrowserAutomation
 from web_grabber.lib.network import (
     HttpxHandler,
     NetworkHandler,
@@ -25,6 +12,27 @@ from web_grabber.lib.network.tor_handler.tor_handler import (
     reset_tor_connection,
 )
 
+# Browser backends pull in heavy dependencies (selenium, camoufox), so they
+# and their legacy helpers are only imported on first access
+_CAMOUFOX_MODULE = (
+    "web_grabber.lib.browser_automation.camoufox_handler.camoufox_handler"
+)
+_SELENIUM_MODULE = (
+    "web_grabber.lib.browser_automation.selenium_handler.selenium_handler"
+)
+_LAZY_IMPORTS = {
+    "CamoufoxBrowser": _CAMOUFOX_MODULE,
+    "get_camoufox_session": _CAMOUFOX_MODULE,
+    "SeleniumBrowser": _SELENIUM_MODULE,
+    # Legacy compatibility imports for backward compatibility
+    "get_selenium_session": _SELENIUM_MODULE,
+    "get_page_content": _SELENIUM_MODULE,
+    "close_selenium_session": _SELENIUM_MODULE,
+}
+
+__getattr__ = make_lazy_getattr(globals(), _LAZY_IMPORTS)
+
+
 __all__ = [
     # Browser automation
     "BrowserAutomation",
@@ -1,11 +1,16 @@
 """Browser automation module for web-grabber."""
 
+from web_grabber._lazy import make_lazy_getattr
 from web_grabber.lib.browser_automation.base import BrowserAutomation
-from web_grabber.lib.browser_automation.camoufox_handler.camoufox_handler import (
-    CamoufoxBrowser,
-)
-from web_grabber.lib.browser_automation.selenium_handler.selenium_handler import (
-    SeleniumBrowser,
-)
+
+# Browser backends pull in heavy dependencies (selenium, camoufox), so they
+# are only imported on first access
+_LAZY_IMPORTS = {
+    "CamoufoxBrowser": "web_grabber.lib.browser_automation.camoufox_handler.camoufox_handler",
+    "SeleniumBrowser": "web_grabber.lib.browser_automation.selenium_handler.selenium_handler",
+}
+
+__getattr__ = make_lazy_getattr(globals(), _LAZY_IMPORTS)
+
 
 __all__ = ["BrowserAutomation", "SeleniumBrowser", "CamoufoxBrowser"]
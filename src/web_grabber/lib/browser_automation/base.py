@@ -1,17 +1,46 @@
 """Base class for browser automation in web-grabber."""
 
+import functools
 import logging
 import os
 import re
+import threading
 import urllib.parse
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 
 logger = logging.getLogger(__name__)
 
+# Matches hrefs that never point to a crawlable page
+_SKIP_RE = re.compile(r"(?:#|javascript:|mailto:|tel:)", re.IGNORECASE)
+_ABS_PREFIXES = ("http://", "https://")
+
+# Query parameters that only track the visitor and never change the page
+_TRACKING_PARAMS = frozenset(("fbclid", "gclid", "msclkid"))
+
+# Ports that are implied by the scheme and so don't distinguish URLs
+_DEFAULT_PORTS = {"http": ":80", "https": ":443"}
+
+# Tags that mark the start of an HTML document
+_HTML_MARKER_RE = re.compile(r"<!doctype html|<html|<head|<body", re.IGNORECASE)
+
+# Matches url(...) references inside inline style attributes
+_CSS_URL_RE = re.compile(r'url\([\'"]?([^\'"]*)[\'"]?\)')
+
+# Last document parsed on each thread, so a page fetched and then scanned for
+# resources and links by the same worker is only parsed once
+_parse_cache = threading.local()
+
+
+@functools.lru_cache(maxsize=64)
+def _parsed(url: str) -> urllib.parse.SplitResult:
+    """Split a URL, caching the result for base URLs shared by many links."""
+    return urllib.parse.urlsplit(url)
+
 
 class BrowserAutomation:
     """Base class for browser automation implementations with standard functionality."""
@@ -89,7 +118,7 @@ class BrowserAutomation:
             html_content = response.text
 
             # Check if the content is valid HTML
-            if not html_content or not self._is_valid_html(html_content):
+            if not html_content or not self.looks_like_html(html_content):
                 logger.warning(f"Content from {url} doesn't appear to be valid HTML")
                 self.add_failed_url(url)
                 return html_content, resources
@@ -121,10 +150,14 @@ class BrowserAutomation:
         logger.warning("Screenshot not supported with standard browser implementation")
         logger.warning("Use Selenium or Camoufox handlers for screenshot support")
 
-    def _is_valid_html(self, content: str) -> bool:
+    @staticmethod
+    def looks_like_html(content: str) -> bool:
         """
         Check if content appears to be valid HTML.
 
+        Only the start of the content is searched, without lowercasing a copy
+        of the whole page.
+
         Args:
             content: String content to check
 
@@ -139,13 +172,7 @@ class BrowserAutomation:
             return False
 
         # Check for common HTML markers
-        lower_content = content.lower()
-        return (
-            "<!doctype html" in lower_content[:1000]
-            or "<html" in lower_content[:1000]
-            or "<head" in lower_content[:1000]
-            or "<body" in lower_content[:1000]
-        )
+        return _HTML_MARKER_RE.search(content, 0, 1000) is not None
 
     @staticmethod
     def is_valid_url(base_url: str, url: str) -> bool:
@@ -166,7 +193,7 @@ class BrowserAutomation:
         url = url.strip()
 
         # Skip anchors, javascript, mailto, etc.
-        if url.startswith(("#", "javascript:", "mailto:", "tel:")):
+        if _SKIP_RE.match(url):
             return False
 
         # Handle relative URLs
@@ -175,8 +202,8 @@ class BrowserAutomation:
 
         # Check if URL is from the same domain
         try:
-            base_domain = urllib.parse.urlparse(base_url).netloc
-            url_domain = urllib.parse.urlparse(url).netloc
+            base_domain = _parsed(base_url).netloc
+            url_domain = urllib.parse.urlsplit(url).netloc
 
             # Allow subdomains
             return url_domain == base_domain or url_domain.endswith("." + base_domain)
@@ -205,23 +232,22 @@ class BrowserAutomation:
         if not url:
             return base_url
 
+        # Handle fragment identifiers
+        url = url.partition("#")[0]
+
+        # Handle absolute URLs, the most common case, before touching the base
+        if url.startswith(_ABS_PREFIXES):
+            return url
+
         # Parse base URL once for efficiency
-        parsed_base = urllib.parse.urlparse(base_url)
+        parsed_base = _parsed(base_url)
         base_scheme = parsed_base.scheme
         base_netloc = parsed_base.netloc
 
-        # Handle fragment identifiers
-        if "#" in url:
-            url = url.split("#")[0]
-
         # Normalize scheme-relative URLs (//example.com/path)
         if url.startswith("//"):
             return f"{base_scheme}:{url}"
 
-        # Handle absolute URLs
-        if url.startswith(("http://", "https://")):
-            return url
-
         # Handle root-relative URLs
         if url.startswith("/"):
             return f"{base_scheme}://{base_netloc}{url}"
@@ -237,10 +263,58 @@ class BrowserAutomation:
         return url
 
     @staticmethod
+    @functools.lru_cache(maxsize=16384)
+    def canonicalize_url(url: str) -> str:
+        """
+        Reduce a URL to a canonical form for duplicate detection.
+
+        Drops the fragment, tracking query parameters and default port, sorts
+        the remaining query parameters, lowercases the scheme and host, and
+        strips the trailing slash from non-root paths, so variants of the same
+        page compare equal. Results are cached, since navigation and footer
+        links recur on every page.
+
+        Args:
+            url (str): The absolute URL to canonicalize
+
+        Returns:
+            str: Canonical URL
+        """
+        parts = urllib.parse.urlsplit(url)
+
+        query = parts.query
+        if query:
+            query = urllib.parse.urlencode(
+                sorted(
+                    (key, value)
+                    for key, value in urllib.parse.parse_qsl(
+                        query, keep_blank_values=True
+                    )
+                    if not key.startswith("utm_") and key not in _TRACKING_PARAMS
+                )
+            )
+
+        path = parts.path
+        if len(path) > 1 and path.endswith("/"):
+            path = path.rstrip("/") or "/"
+
+        scheme = parts.scheme.lower()
+        netloc = parts.netloc.lower()
+        default_port = _DEFAULT_PORTS.get(scheme)
+        if default_port and netloc.endswith(default_port):
+            netloc = netloc[: -len(default_port)]
+
+        return urllib.parse.urlunsplit((scheme, netloc, path or "/", query, ""))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=16384)
     def get_file_type(url: str) -> str:
         """
         Determine the file type category based on the URL or extension.
 
+        Results are cached, since a page URL is classified again when it's
+        fetched, saved and downloaded, and resource links recur across pages.
+
         Args:
             url (str): The URL to analyze
 
@@ -329,118 +403,186 @@ class BrowserAutomation:
         return "html"
 
     @staticmethod
-    def get_page_links(base_url: str, html_content: str) -> List[str]:
+    def _parse_html(
+        html_content: Union[str, lxml_html.HtmlElement],
+    ) -> lxml_html.HtmlElement:
         """
-        Extract all links from a webpage that belong to the same domain.
+        Parse HTML content into an lxml tree.
+
+        The most recently parsed document is cached per thread, so extracting
+        resources and links from the same page only builds the tree once.
 
         Args:
-            base_url (str): The base URL to resolve against
-            html_content (str): The HTML content to parse
+            html_content: HTML content to parse, or an already parsed tree
 
         Returns:
-            List[str]: Normalized list of URLs
+            lxml_html.HtmlElement: Root element of the parsed document
         """
-        soup = BeautifulSoup(html_content, "html.parser")
-        links = []
+        if isinstance(html_content, lxml_html.HtmlElement):
+            return html_content
+
+        if getattr(_parse_cache, "source", None) is html_content:
+            return _parse_cache.tree
+
+        try:
+            tree = lxml_html.fromstring(html_content)
+        except ValueError:
+            # lxml refuses str input carrying an XML encoding declaration
+            tree = lxml_html.fromstring(html_content.encode("utf-8"))
+        except etree.ParserError:
+            # Fall back to BeautifulSoup for documents lxml can't handle,
+            # importing it only when needed since bs4 is slow to load
+            from lxml.html import soupparser
 
-        # Get all anchor tags
-        for a_tag in soup.find_all("a", href=True):
-            url = a_tag["href"]
-            if BrowserAutomation.is_valid_url(base_url, url):
-                links.append(BrowserAutomation.normalize_url(base_url, url))
+            tree = soupparser.fromstring(html_content)
 
-        return list(set(links))  # Remove duplicates
+        _parse_cache.source = html_content
+        _parse_cache.tree = tree
+        return tree
 
     @staticmethod
-    def get_resources(base_url: str, html_content: str) -> Dict[str, List[str]]:
+    def extract_all(
+        base_url: str, html_content: Union[str, lxml_html.HtmlElement]
+    ) -> Tuple[List[str], Dict[str, List[str]]]:
         """
-        Extract images, videos, and documents from HTML content.
+        Extract links and resources from a webpage in a single traversal.
+
+        Anchors are walked once for both followable links and document
+        resources. The result is remembered for the last document on each
+        thread, so get_resources and get_page_links on the same page share it.
 
         Args:
             base_url (str): The base URL to resolve against
-            html_content (str): The HTML content to parse
+            html_content (str): The HTML content to parse, or a parsed tree
 
         Returns:
-            Dict[str, List[str]]: Resources categorized by type
+            Tuple[List[str], Dict[str, List[str]]]: Links on the same domain
+            and resources categorized by type
         """
-        soup = BeautifulSoup(html_content, "html.parser")
-        resources = {"images": [], "videos": [], "documents": []}
+        cached = getattr(_parse_cache, "extracted", None)
+        if cached and cached[0] is html_content and cached[1] == base_url:
+            return cached[2], cached[3]
+
+        tree = BrowserAutomation._parse_html(html_content)
+        base_domain = _parsed(base_url).netloc
+        subdomain_suffix = "." + base_domain
+
+        # Dict keys deduplicate as we go while keeping document order
+        links = {}
+        resources = {"images": {}, "videos": {}, "documents": {}}
 
         # Get all images
-        for img in soup.find_all("img", src=True):
-            src = img["src"]
+        for src in tree.xpath("//img/@src"):
             if src:
                 src = BrowserAutomation.normalize_url(base_url, src)
-                resources["images"].append(src)
+                resources["images"][src] = None
 
         # Also look for background images in styles
-        for tag in soup.find_all(lambda tag: tag.has_attr("style")):
-            style = tag["style"]
-            urls = re.findall(r'url\([\'"]?([^\'"]*)[\'"]?\)', style)
+        for style in tree.xpath("//@style"):
+            urls = _CSS_URL_RE.findall(style)
             for url in urls:
                 if url:
                     normalized_url = BrowserAutomation.normalize_url(base_url, url)
                     resource_type = BrowserAutomation.get_file_type(normalized_url)
                     if resource_type == "images":
-                        resources["images"].append(normalized_url)
+                        resources["images"][normalized_url] = None
+
+        # Get all videos, including source tags inside video
+        for src in tree.xpath("//video/@src | //video//source/@src"):
+            src = BrowserAutomation.normalize_url(base_url, src)
+            resources["videos"][src] = None
+
+        # Get all anchor tags, both for links and for documents
+        for href in tree.xpath("//a/@href"):
+            href = href.strip()
+
+            # Skip anchors, javascript, mailto, etc.
+            if not href or _SKIP_RE.match(href):
+                continue
+
+            # Resolve first, so relative links of every form get the same check
+            url = BrowserAutomation.normalize_url(base_url, href)
+
+            # Only follow links on the same domain or its subdomains
+            url_domain = urllib.parse.urlsplit(url).netloc
+            if url_domain == base_domain or url_domain.endswith(subdomain_suffix):
+                links[url] = None
+
+            resource_type = BrowserAutomation.get_file_type(url)
+
+            # Skip resources that were flagged to be skipped
+            if resource_type == "skip":
+                continue
+
+            # Only add documents that match specific patterns or have specific extensions
+            if resource_type == "documents":
+                # Only download PDFs with relevant names or from specific paths
+                parsed_url = urllib.parse.urlparse(url)
+                path = parsed_url.path.lower()
+                filename = os.path.basename(path)
+
+                # Special handling for resumes and common document types
+                if path.endswith(".pdf"):
+                    # Check for resume, CV, specific document types
+                    if (
+                        "resume" in filename
+                        or "cv" in filename
+                        or "document" in filename
+                        or "assets/documents" in path
+                        or "docs/" in path
+                        or "publications/" in path
+                    ):
+                        resources["documents"][url] = None
+                        logger.info(f"Added document resource: {url}")
+                else:
+                    # For non-PDF documents, we're less restrictive
+                    resources["documents"][url] = None
+
+        result = (
+            list(links),
+            {kind: list(urls) for kind, urls in resources.items()},
+        )
+        _parse_cache.extracted = (html_content, base_url) + result
+        return result
 
-        # Get all videos
-        for video in soup.find_all("video"):
-            if video.has_attr("src"):
-                src = video["src"]
-                src = BrowserAutomation.normalize_url(base_url, src)
-                resources["videos"].append(src)
+    @staticmethod
+    def get_page_links(
+        base_url: str, html_content: Union[str, lxml_html.HtmlElement]
+    ) -> List[str]:
+        """
+        Extract all links from a webpage that belong to the same domain.
 
-            # Check for source tags inside video
-            for source in video.find_all("source", src=True):
-                src = source["src"]
-                src = BrowserAutomation.normalize_url(base_url, src)
-                resources["videos"].append(src)
-
-        # Get links to documents - be more selective
-        for link in soup.find_all("a", href=True):
-            href = link["href"]
-            if href:
-                href = BrowserAutomation.normalize_url(base_url, href)
-                resource_type = BrowserAutomation.get_file_type(href)
-
-                # Skip resources that were flagged to be skipped
-                if resource_type == "skip":
-                    continue
-
-                # Only add documents that match specific patterns or have specific extensions
-                if resource_type == "documents":
-                    # Only download PDFs with relevant names or from specific paths
-                    parsed_url = urllib.parse.urlparse(href)
-                    path = parsed_url.path.lower()
-                    filename = os.path.basename(path)
-
-                    # Special handling for resumes and common document types
-                    if path.endswith(".pdf"):
-                        # Check for resume, CV, specific document types
-                        if (
-                            "resume" in filename
-                            or "cv" in filename
-                            or "document" in filename
-                            or "assets/documents" in path
-                            or "docs/" in path
-                            or "publications/" in path
-                        ):
-                            resources["documents"].append(href)
-                            logger.info(f"Added document resource: {href}")
-                    else:
-                        # For non-PDF documents, we're less restrictive
-                        resources["documents"].append(href)
-
-        # Deduplicate
-        resources["images"] = list(set(resources["images"]))
-        resources["videos"] = list(set(resources["videos"]))
-        resources["documents"] = list(set(resources["documents"]))
-
-        return resources
+        Args:
+            base_url (str): The base URL to resolve against
+            html_content (str): The HTML content to parse, or a parsed tree
+
+        Returns:
+            List[str]: Normalized list of URLs
+        """
+        links, _ = BrowserAutomation.extract_all(base_url, html_content)
+        return list(links)
+
+    @staticmethod
+    def get_resources(
+        base_url: str, html_content: Union[str, lxml_html.HtmlElement]
+    ) -> Dict[str, List[str]]:
+        """
+        Extract images, videos, and documents from HTML content.
+
+        Args:
+            base_url (str): The base URL to resolve against
+            html_content (str): The HTML content to parse, or a parsed tree
+
+        Returns:
+            Dict[str, List[str]]: Resources categorized by type
+        """
+        _, resources = BrowserAutomation.extract_all(base_url, html_content)
+        return {kind: list(urls) for kind, urls in resources.items()}
 
     @staticmethod
-    def validate_downloaded_file(file_path: Path, resource_type: str, url: str) -> bool:
+    def validate_downloaded_file(
+        file_path: Path, resource_type: str, url: str, file_size: Optional[int] = None
+    ) -> bool:
         """
         Validate a downloaded file for integrity and content.
 
@@ -448,18 +590,20 @@ class BrowserAutomation:
             file_path (Path): Path to the downloaded file
             resource_type (str): Type of resource
             url (str): Source URL
+            file_size (int, optional): Size of the file, if the caller already
+                has it from a stat
 
         Returns:
             bool: True if valid, False otherwise
         """
         try:
-            # Verify the file exists
-            if not file_path.exists():
-                logger.error(f"Downloaded file does not exist: {file_path}")
-                return False
-
-            # Check file size
-            file_size = os.path.getsize(file_path)
+            # Verify the file exists and check its size with a single stat
+            if file_size is None:
+                try:
+                    file_size = file_path.stat().st_size
+                except FileNotFoundError:
+                    logger.error(f"Downloaded file does not exist: {file_path}")
+                    return False
 
             # For images, we expect at least 100 bytes for a valid image
             if resource_type == "images" and file_size < 100:
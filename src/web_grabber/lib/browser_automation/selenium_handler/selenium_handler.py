@@ -129,7 +129,7 @@ class SeleniumBrowser(BrowserAutomation):
             html_content = self.driver.page_source
 
             # Check if the content is valid HTML
-            if not html_content or not self._is_valid_html(html_content):
+            if not html_content or not self.looks_like_html(html_content):
                 logger.warning(f"Content from {url} doesn't appear to be valid HTML")
                 self.add_failed_url(url)
                 return html_content, resources
@@ -147,32 +147,6 @@ class SeleniumBrowser(BrowserAutomation):
             self.add_failed_url(url)
             return "", resources
 
-    def _is_valid_html(self, content: str) -> bool:
-        """
-        Check if content appears to be valid HTML.
-
-        Args:
-            content: String content to check
-
-        Returns:
-            bool: True if content appears to be HTML, False otherwise
-        """
-        if not content:
-            return False
-
-        # Check for PDF signature
-        if content.startswith("%PDF-"):
-            return False
-
-        # Check for common HTML markers
-        lower_content = content.lower()
-        return (
-            "<!doctype html" in lower_content[:1000]
-            or "<html" in lower_content[:1000]
-            or "<head" in lower_content[:1000]
-            or "<body" in lower_content[:1000]
-        )
-
     def _scroll_page(self) -> None:
         """Scroll the page to load lazy-loaded content."""
         try:
@@ -0,0 +1,8 @@
+"""Memory-efficient duplicate detection for crawled URLs."""
+
+from web_grabber.lib.dedup.bloom_filter import BloomFilter, VisitedUrlSet
+
+__all__ = [
+    "BloomFilter",
+    "VisitedUrlSet",
+]
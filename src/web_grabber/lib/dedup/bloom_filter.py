@@ -0,0 +1,244 @@
+"""Bloom filter backed set of visited URLs."""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+# Header of a file-backed filter: magic, bit count and hash count, so a file
+# written for a differently sized filter is never reused, then the number of
+# items added so far
+_HEADER = struct.Struct("<4sQIQ")
+_MAGIC = b"WGBF"
+
+# The item count, last in the header
+_COUNT = struct.Struct("<Q")
+_COUNT_OFFSET = _HEADER.size - _COUNT.size
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, stored in a bytearray."""
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        path: Optional[Union[str, Path]] = None,
+        reset: bool = False,
+    ):
+        """
+        Initialize the Bloom filter.
+
+        Args:
+            capacity (int): Number of items the filter is sized for
+            error_rate (float): False positive rate once `capacity` items are added
+            path (str | Path, optional): File to keep the bits in, so they
+                survive the process. Defaults to None, keeping them in memory.
+            reset (bool): Whether to discard the bits already stored at `path`
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Optimal bit and hash counts for the requested capacity and error rate
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        # Distinct items added, not counting false positives
+        self.count = 0
+        self._mmap: Optional[mmap.mmap] = None
+        size = (self.num_bits + 7) // 8
+        if path is None:
+            # Zero-filled up front, so all of it is resident from the start
+            self._bits = bytearray(size)
+        else:
+            self._bits = self._map_file(path, size, reset)
+
+    def _map_file(self, path: Union[str, Path], size: int, reset: bool) -> memoryview:
+        """
+        Map the filter's bits from a file, creating or resetting it as needed.
+
+        Restores the item count stored with the bits.
+
+        Args:
+            path (str | Path): File to keep the bits in
+            size (int): Number of bytes of bits
+            reset (bool): Whether to discard the bits already in the file
+
+        Returns:
+            memoryview: Writable view of the bits in the mapped file
+        """
+        identity = (_MAGIC, self.num_bits, self.num_hashes)
+        total = _HEADER.size + size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, "r+b") as f:
+            header = f.read(_HEADER.size)
+            if (
+                not reset
+                and os.fstat(fd).st_size == total
+                and _HEADER.unpack(header)[:3] == identity
+            ):
+                self.count = _HEADER.unpack(header)[3]
+            else:
+                # Start from an empty file; it's sparse, so unset bits take
+                # no disk space until pages of them are written
+                f.truncate(0)
+                f.truncate(total)
+                f.seek(0)
+                f.write(_HEADER.pack(*identity, 0))
+                f.flush()
+            # Pages are faulted in on first access, making a reopen instant
+            self._mmap = mmap.mmap(fd, total)
+        return memoryview(self._mmap)[_HEADER.size :]
+
+    def _positions(self, item: str):
+        """
+        Yield the bit positions for an item.
+
+        Uses double hashing, deriving every position from one 128-bit digest
+        instead of computing `num_hashes` separate hashes.
+
+        Args:
+            item (str): Item to hash
+
+        Yields:
+            int: Bit index into the filter
+        """
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> bool:
+        """
+        Add an item to the filter.
+
+        Args:
+            item (str): Item to add
+
+        Returns:
+            bool: True if the item was (probably) already present
+        """
+        bits = self._bits
+        present = True
+        for pos in self._positions(item):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+
+        if not present:
+            self.count += 1
+            # Keep the count with the bits, so a reopened filter has it too
+            if self._mmap is not None:
+                _COUNT.pack_into(self._mmap, _COUNT_OFFSET, self.count)
+        return present
+
+    def __len__(self) -> int:
+        """Return the number of distinct items added, not counting false positives."""
+        return self.count
+
+    def __contains__(self, item: str) -> bool:
+        """Check whether an item was probably added before."""
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def flush(self) -> None:
+        """Write the bits to the backing file, if the filter has one."""
+        if self._mmap is not None:
+            self._mmap.flush()
+
+    def close(self) -> None:
+        """Write the bits to the backing file and unmap it, if the filter has one."""
+        if self._mmap is not None:
+            self.flush()
+            # The view must be released before the map can be closed
+            self._bits.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+class VisitedUrlSet:
+    """
+    Set-like record of visited URLs using a Bloom filter plus a small LRU cache.
+
+    Membership is approximate: a URL that was never added is reported as
+    visited with probability of about `error_rate`, so the crawler may skip a
+    page now and then but never fetches one twice. The LRU cache answers the
+    common case of links repeated on every page (navigation, footers) without
+    hashing them.
+    """
+
+    # Number of recently seen URLs answered from the cache
+    RECENT_SIZE = 10_000
+
+    def __init__(
+        self,
+        capacity: int = 10_000_000,
+        error_rate: float = 1e-4,
+        path: Optional[Union[str, Path]] = None,
+        reset: bool = False,
+    ):
+        """
+        Initialize the visited URL set.
+
+        Args:
+            capacity (int): Number of URLs the Bloom filter is sized for
+            error_rate (float): False positive rate at `capacity` URLs
+            path (str | Path, optional): File to keep the Bloom filter in, so
+                a later crawl can resume from it. Defaults to None.
+            reset (bool): Whether to forget the URLs already stored at `path`
+        """
+        self._filter = BloomFilter(capacity, error_rate, path=path, reset=reset)
+        self._recent: OrderedDict = OrderedDict()
+
+    def _remember(self, url: str) -> None:
+        """
+        Mark a URL as recently seen, evicting the oldest one when full.
+
+        Args:
+            url (str): URL to remember
+        """
+        self._recent[url] = None
+        self._recent.move_to_end(url)
+        if len(self._recent) > self.RECENT_SIZE:
+            self._recent.popitem(last=False)
+
+    def add(self, url: str) -> None:
+        """
+        Record a URL as visited.
+
+        Args:
+            url (str): URL to add
+        """
+        if url in self._recent:
+            self._recent.move_to_end(url)
+            return
+        self._filter.add(url)
+        self._remember(url)
+
+    def __contains__(self, url: str) -> bool:
+        """Check whether a URL was (probably) visited."""
+        if url in self._recent:
+            self._recent.move_to_end(url)
+            return True
+        return url in self._filter
+
+    def __len__(self) -> int:
+        """Return the number of distinct URLs added, not counting false positives."""
+        return len(self._filter)
+
+    def flush(self) -> None:
+        """Write the visited URLs to the backing file, if there is one."""
+        self._filter.flush()
+
+    def close(self) -> None:
+        """Write the visited URLs to the backing file and close it, if there is one."""
+        self._filter.close()
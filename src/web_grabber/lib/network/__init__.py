@@ -1,7 +1,9 @@
 """Network handling module for web-grabber."""
 
 from web_grabber.lib.network.base import NetworkHandler
+from web_grabber.lib.network.dns_cache import DnsCache
 from web_grabber.lib.network.http_handler.http_handler import HttpxHandler
+from web_grabber.lib.network.rate_limiter import HostRateLimiter, RateLimiter
 from web_grabber.lib.network.tor_handler.tor_handler import (
     TorHandler,
     configure_tor,
@@ -12,6 +14,9 @@ __all__ = [
     "NetworkHandler",
     "TorHandler",
     "HttpxHandler",
+    "RateLimiter",
+    "HostRateLimiter",
+    "DnsCache",
     "configure_tor",
     "reset_tor_connection",
 ]
@@ -0,0 +1,8 @@
+"""aria2c handler module for batch downloads."""
+
+from web_grabber.lib.network.aria2_handler.aria2_handler import (
+    ARIA2_AVAILABLE,
+    Aria2Downloader,
+)
+
+__all__ = ["Aria2Downloader", "ARIA2_AVAILABLE"]
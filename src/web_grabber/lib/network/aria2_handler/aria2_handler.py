@@ -0,0 +1,135 @@
+"""Batch downloads through an external aria2c process."""
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import List, Tuple
+
+# aria2c is an optional external tool, not a Python package
+ARIA2_PATH = shutil.which("aria2c")
+ARIA2_AVAILABLE = ARIA2_PATH is not None
+
+logger = logging.getLogger(__name__)
+
+
+class Aria2Downloader:
+    """Downloads batches of files with a single aria2c process."""
+
+    # Largest number of files handed to one aria2c run
+    BATCH_SIZE = 200
+
+    def __init__(
+        self,
+        user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.81 Safari/537.36",
+        timeout: int = 30,
+        retries: int = 3,
+        max_concurrent_downloads: int = 16,
+        connections_per_server: int = 4,
+    ):
+        """
+        Initialize the aria2c downloader.
+
+        Args:
+            user_agent: User agent string to use for requests
+            timeout: Request timeout in seconds
+            retries: Number of tries for each file
+            max_concurrent_downloads: Files downloaded in parallel
+            connections_per_server: Connections opened to each server
+        """
+        if not ARIA2_AVAILABLE:
+            raise RuntimeError("aria2c is not installed or not on PATH")
+
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.retries = retries
+        self.max_concurrent_downloads = max_concurrent_downloads
+        self.connections_per_server = connections_per_server
+
+    def _build_command(self, input_file: str) -> List[str]:
+        """
+        Build the aria2c command line for an input file.
+
+        Args:
+            input_file: Path to the aria2 input file listing the downloads
+
+        Returns:
+            List[str]: The command and its arguments
+        """
+        return [
+            ARIA2_PATH,
+            f"--input-file={input_file}",
+            f"--max-concurrent-downloads={self.max_concurrent_downloads}",
+            f"--max-connection-per-server={self.connections_per_server}",
+            f"--split={self.connections_per_server}",
+            f"--user-agent={self.user_agent}",
+            f"--timeout={self.timeout}",
+            f"--max-tries={self.retries}",
+            "--allow-overwrite=true",
+            "--auto-file-renaming=false",
+            "--console-log-level=error",
+            "--quiet=true",
+        ]
+
+    def download_batch(self, downloads: List[Tuple[str, Path]]) -> List[bool]:
+        """
+        Download files, running one aria2c process per batch.
+
+        Args:
+            downloads: (url, file_path) pairs to download
+
+        Returns:
+            List[bool]: Whether each download succeeded, in input order
+        """
+        results = []
+        for start in range(0, len(downloads), self.BATCH_SIZE):
+            results.extend(self._run(downloads[start : start + self.BATCH_SIZE]))
+        return results
+
+    def _run(self, downloads: List[Tuple[str, Path]]) -> List[bool]:
+        """
+        Download one batch of files with a single aria2c process.
+
+        Args:
+            downloads: (url, file_path) pairs to download
+
+        Returns:
+            List[bool]: Whether each download succeeded, in input order
+        """
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".aria2-input", delete=False, encoding="utf-8"
+        ) as f:
+            for url, file_path in downloads:
+                f.write(f"{url}\n  dir={file_path.parent}\n  out={file_path.name}\n")
+            input_file = f.name
+
+        try:
+            result = subprocess.run(
+                self._build_command(input_file),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            if result.returncode != 0:
+                logger.warning(
+                    f"aria2c exited with code {result.returncode}: "
+                    f"{result.stderr.strip()}"
+                )
+        except OSError as e:
+            logger.error(f"Could not run aria2c: {e}")
+        finally:
+            os.unlink(input_file)
+
+        # aria2c leaves a .aria2 control file next to every incomplete download
+        results = []
+        for _, file_path in downloads:
+            control_file = file_path.with_name(file_path.name + ".aria2")
+            if control_file.exists():
+                control_file.unlink()
+                file_path.unlink(missing_ok=True)
+                results.append(False)
+            else:
+                results.append(file_path.exists())
+        return results
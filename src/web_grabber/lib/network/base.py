@@ -1,14 +1,18 @@
 """Base network handler for web-grabber."""
 
+import functools
 import logging
+import shutil
 import time
 from typing import Dict, List, Optional, Tuple
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from web_grabber.lib.network.rate_limiter import HostRateLimiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,6 +42,9 @@ class NetworkHandler:
         self.retries = retries
         self.backoff_factor = backoff_factor
         self.delay_between_requests = delay_between_requests
+        self.rate_limiter = HostRateLimiter(delay_between_requests)
+        # Largest file download_file fetches, in bytes, or 0 for no limit
+        self.max_file_size = 0
         self.session = self._create_session()
         self.last_request_time = 0.0
         
@@ -57,6 +64,7 @@ class NetworkHandler:
         )
 
         # Mount the retry adapter to both HTTP and HTTPS
+        self._retry_strategy = retry_strategy
         adapter = HTTPAdapter(max_retries=retry_strategy)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
@@ -96,7 +104,7 @@ class NetworkHandler:
             requests.Response: Response object
         """
         # Apply rate limiting
-        self._respect_rate_limits()
+        self._respect_rate_limits(url)
 
         # Apply custom headers if provided
         final_headers = self.session.headers.copy()
@@ -113,12 +121,31 @@ class NetworkHandler:
             stream=stream,
         )
 
-    def _respect_rate_limits(self) -> None:
-        """Delay request if necessary to respect rate limits."""
-        if self.last_request_time > 0:
-            elapsed = time.time() - self.last_request_time
-            if elapsed < self.delay_between_requests:
-                time.sleep(self.delay_between_requests - elapsed)
+    def _respect_rate_limits(self, url: str) -> None:
+        """
+        Delay request if necessary to respect rate limits.
+
+        Args:
+            url (str): URL about to be requested
+        """
+        # Shared by all worker threads, so the limit holds for the whole crawl
+        self.rate_limiter.acquire(url)
+
+    def set_pool_size(self, max_connections: int) -> None:
+        """
+        Size the connection pool for the given number of concurrent requests.
+
+        Without this, worker threads beyond the default pool size of 10 open
+        and discard a new connection for every request.
+
+        Args:
+            max_connections (int): Maximum number of concurrent connections per host
+        """
+        adapter = HTTPAdapter(
+            max_retries=self._retry_strategy, pool_maxsize=max_connections
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def configure_proxies(self) -> None:
         """Configure proxies for the session. Default implementation uses no proxies."""
@@ -141,20 +168,82 @@ class NetworkHandler:
         self.close()
 
     @staticmethod
+    @functools.lru_cache(maxsize=16384)
     def extract_domain(url: str) -> str:
         """
         Extract domain from URL.
 
+        Results are cached, since every link on every page is checked.
+
         Args:
             url (str): URL to parse
 
         Returns:
             str: Domain name
         """
-        parsed = urlparse(url)
-        return parsed.netloc
+        return urlsplit(url).netloc
+
+    def _outside_size_limits(self, url: str, headers, min_size: int = 0) -> bool:
+        """
+        Check a response's declared size against the size limits.
+
+        Args:
+            url (str): URL of the response
+            headers: Response headers
+            min_size (int): Smallest body worth saving, in bytes
+
+        Returns:
+            bool: True if the body is declared larger than max_file_size or
+                smaller than min_size
+        """
+        if not self.max_file_size and not min_size:
+            return False
+
+        length = headers.get("Content-Length", "")
+        if not length.isdigit():
+            return False
+
+        if self.max_file_size and int(length) > self.max_file_size:
+            logger.warning(
+                f"Skipping {url}: {length} bytes exceeds the "
+                f"{self.max_file_size} byte limit"
+            )
+            return True
+        if int(length) < min_size:
+            logger.warning(f"Skipping {url}: {length} bytes is too small to be valid")
+            return True
+        return False
+
+    @staticmethod
+    def _has_rejected_type(url: str, headers, reject_types: Tuple[str, ...]) -> bool:
+        """
+        Check a response's declared Content-Type against unwanted types.
+
+        Args:
+            url (str): URL of the response
+            headers: Response headers
+            reject_types (Tuple[str, ...]): Content-Type prefixes to skip
+
+        Returns:
+            bool: True if the body is declared to be one of reject_types
+        """
+        if not reject_types:
+            return False
 
-    def download_file(self, url: str, file_path: str, chunk_size: int = 8192) -> bool:
+        content_type = headers.get("Content-Type", "").lower()
+        if content_type.startswith(reject_types):
+            logger.warning(f"Skipping {url}: unexpected content type {content_type}")
+            return True
+        return False
+
+    def download_file(
+        self,
+        url: str,
+        file_path: str,
+        chunk_size: int = 131072,
+        min_size: int = 0,
+        reject_types: Tuple[str, ...] = (),
+    ) -> bool:
         """
         Download a file from URL to specified path.
 
@@ -162,20 +251,30 @@ class NetworkHandler:
             url (str): URL to download
             file_path (str): Where to save the file
             chunk_size (int): Size of chunks to download
+            min_size (int): Skip files declared smaller than this many bytes
+            reject_types (Tuple[str, ...]): Skip files declared to be of a
+                Content-Type starting with one of these
 
         Returns:
             bool: True if successful, False otherwise
         """
         try:
             # Make request
-            response = self.get(url, stream=True)
-            response.raise_for_status()
-
-            # Write file in chunks
-            with open(file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        f.write(chunk)
+            with self.get(url, stream=True) as response:
+                response.raise_for_status()
+
+                # Headers arrive before the body, so files of the wrong size
+                # cost neither the body nor a write
+                if self._outside_size_limits(
+                    url, response.headers, min_size
+                ) or self._has_rejected_type(url, response.headers, reject_types):
+                    return False
+
+                # Let urllib3 undo any content encoding, then copy the body to
+                # disk in large chunks without a Python-level loop
+                response.raw.decode_content = True
+                with open(file_path, "wb", buffering=0) as f:
+                    shutil.copyfileobj(response.raw, f, chunk_size)
 
             return True
         except Exception as e:
@@ -196,19 +295,16 @@ class NetworkHandler:
 
         return BrowserAutomation.get_file_type(url)
 
-    def get_page_content(
-        self, url: str, wait_for_js: bool = False, scroll: bool = False
-    ) -> Tuple[str, Dict[str, List[str]]]:
+    def fetch_page(self, url: str) -> Tuple[str, bytes]:
         """
-        Get the page content and related resources from a URL.
+        Fetch the HTML of a page without parsing it.
 
         Args:
             url: URL to request
-            wait_for_js: Whether to wait for JavaScript to load
-            scroll: Whether to scroll the page
 
         Returns:
-            Tuple[str, Dict[str, List[str]]]: The page content and related resources
+            Tuple[str, bytes]: The decoded page content and the raw body, or
+            empty ones if the request failed
         """
         try:
             # Make the request
@@ -217,17 +313,32 @@ class NetworkHandler:
             # Check if successful
             if response.status_code != 200:
                 logger.warning(f"Got status code {response.status_code} for {url}")
-                return "", {}
+                return "", b""
 
-            # Get content
-            html_content = response.text
+            return response.text, response.content
+        except Exception as e:
+            logger.error(f"Error getting page content for {url}: {e}")
+            return "", b""
 
-            # Extract resources
-            from web_grabber.lib.browser_automation.base import BrowserAutomation
+    def get_page_content(
+        self, url: str, wait_for_js: bool = False, scroll: bool = False
+    ) -> Tuple[str, Dict[str, List[str]]]:
+        """
+        Get the page content and related resources from a URL.
 
-            resources = BrowserAutomation.get_resources(url, html_content)
+        Args:
+            url: URL to request
+            wait_for_js: Whether to wait for JavaScript to load
+            scroll: Whether to scroll the page
 
-            return html_content, resources
-        except Exception as e:
-            logger.error(f"Error getting page content for {url}: {e}")
+        Returns:
+            Tuple[str, Dict[str, List[str]]]: The page content and related resources
+        """
+        html_content, _ = self.fetch_page(url)
+        if not html_content:
             return "", {}
+
+        # Extract resources
+        from web_grabber.lib.browser_automation.base import BrowserAutomation
+
+        return html_content, BrowserAutomation.get_resources(url, html_content)
@@ -0,0 +1,61 @@
+"""Process-wide DNS cache used while a crawl runs."""
+
+import socket
+import time
+from typing import Any, Dict, List, Tuple
+
+
+class DnsCache:
+    """
+    Context manager that caches socket.getaddrinfo results while active.
+
+    Neither requests nor httpx cache DNS answers, so every new pooled
+    connection would resolve its host again. While active, all lookups in the
+    process go through this cache, including those made by the async client
+    through the event loop's resolver threads.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        """
+        Initialize the DNS cache.
+
+        Args:
+            ttl (float): Seconds to reuse a lookup result
+        """
+        self.ttl = ttl
+        self._cache: Dict[Tuple, Tuple[float, List[Any]]] = {}
+        self._original = None
+
+    def _getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """Drop-in replacement for socket.getaddrinfo that reuses results."""
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry and entry[0] > now:
+            return list(entry[1])
+
+        # Failures aren't cached, so a transient DNS error is retried
+        result = self._original(host, port, family, type, proto, flags)
+        self._cache[key] = (now + self.ttl, result)
+        return list(result)
+
+    def install(self) -> None:
+        """Route socket.getaddrinfo through the cache."""
+        if self._original is None:
+            self._original = socket.getaddrinfo
+            socket.getaddrinfo = self._getaddrinfo
+
+    def uninstall(self) -> None:
+        """Restore the original socket.getaddrinfo."""
+        if self._original is not None:
+            socket.getaddrinfo = self._original
+            self._original = None
+
+    def __enter__(self):
+        """Context manager entry point."""
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit point."""
+        self.uninstall()
@@ -1,8 +1,10 @@
 """HTTP handler implementation using httpx."""
 
+import asyncio
+import importlib.util
 import logging
-import time
 from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
 try:
     import httpx
@@ -13,6 +15,9 @@ except ImportError:
 
 from web_grabber.lib.network.base import NetworkHandler
 
+# HTTP/2 support in httpx needs the optional h2 package
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,8 +50,13 @@ class HttpxHandler(NetworkHandler):
             delay_between_requests=delay_between_requests,
         )
 
-        # Httpx client
+        # Httpx clients
         self._client = None
+        self._async_client = None
+
+        # Per-host request slots for the async client, keyed by netloc
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._max_per_host = 0
 
         # Initialize httpx client
         self._initialize_client()
@@ -54,24 +64,29 @@ class HttpxHandler(NetworkHandler):
         # For compatibility with NetworkHandler
         self.session = self  # We'll mimic some of the requests.Session API
 
-        # Last request time for rate limiting
-        self._last_request_time = 0
-
-    def _initialize_client(self) -> None:
-        """Initialize the httpx client with appropriate settings."""
-        # Create transport with retries
-        transport = httpx.HTTPTransport(retries=self.retries)
+    def _initialize_client(self, max_connections: int = 10) -> None:
+        """
+        Initialize the httpx client with appropriate settings.
 
-        # Create limits
+        Args:
+            max_connections: Maximum number of concurrent connections
+        """
+        # Keep every connection alive; worker threads keep returning to the
+        # same hosts, and a dropped connection costs a new TCP+TLS handshake
         limits = httpx.Limits(
-            max_keepalive_connections=5, max_connections=10, keepalive_expiry=30.0
+            max_keepalive_connections=max_connections,
+            max_connections=max_connections,
+            keepalive_expiry=30.0,
         )
 
+        # Create transport with retries; the client ignores its own limits
+        # once a transport is given, so they belong here
+        transport = httpx.HTTPTransport(retries=self.retries, limits=limits)
+
         # Create client with transport and timeout
         self._client = httpx.Client(
             transport=transport,
             timeout=self.timeout,
-            limits=limits,
             follow_redirects=True,
             headers={"User-Agent": self.user_agent},
         )
@@ -105,11 +120,12 @@ class HttpxHandler(NetworkHandler):
             httpx.Response object
         """
         # Respect rate limits
-        self._respect_rate_limits()
+        self._respect_rate_limits(url)
 
         try:
             # Log the request
-            logger.debug(f"GET request to {url}")
+            # Lazy formatting: this runs per request and debug is usually off
+            logger.debug("GET request to %s", url)
 
             # Make the request
             response = self._client.get(
@@ -119,9 +135,6 @@ class HttpxHandler(NetworkHandler):
             # Raise for status (similar to requests)
             response.raise_for_status()
 
-            # Update last request time
-            self._last_request_time = time.time()
-
             return response
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error for {url}: {e.response.status_code} - {e}")
@@ -130,14 +143,24 @@ class HttpxHandler(NetworkHandler):
             logger.error(f"Request error for {url}: {e}")
             raise
 
-    def _respect_rate_limits(self) -> None:
-        """Ensure we respect the rate limits by waiting if needed."""
-        if self._last_request_time > 0:
-            elapsed = time.time() - self._last_request_time
-            if elapsed < self.delay_between_requests:
-                sleep_time = self.delay_between_requests - elapsed
-                logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-                time.sleep(sleep_time)
+    def _respect_rate_limits(self, url: str) -> None:
+        """
+        Ensure we respect the rate limits by waiting if needed.
+
+        Args:
+            url: URL about to be requested
+        """
+        self.rate_limiter.acquire(url)
+
+    def set_pool_size(self, max_connections: int) -> None:
+        """
+        Size the connection pool for the given number of concurrent requests.
+
+        Args:
+            max_connections: Maximum number of concurrent connections
+        """
+        self.close()
+        self._initialize_client(max_connections)
 
     def close(self) -> None:
         """Close the httpx client and release resources."""
@@ -151,7 +174,14 @@ class HttpxHandler(NetworkHandler):
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
-    def download_file(self, url: str, file_path: str, chunk_size: int = 8192) -> bool:
+    def download_file(
+        self,
+        url: str,
+        file_path: str,
+        chunk_size: int = 131072,
+        min_size: int = 0,
+        reject_types: Tuple[str, ...] = (),
+    ) -> bool:
         """
         Download a file from the specified URL.
 
@@ -159,68 +189,215 @@ class HttpxHandler(NetworkHandler):
             url: URL of the file to download
             file_path: Path where to save the file
             chunk_size: Size of chunks to use for streaming
+            min_size: Skip files declared smaller than this many bytes
+            reject_types: Skip files declared to be of a Content-Type starting
+                with one of these
 
         Returns:
             bool: True if download succeeded, False otherwise
         """
         try:
-            response = self.get(url, stream=True)
-            if response.status_code == 200:
-                with open(file_path, "wb") as f:
+            # Stream the body instead of loading it into memory first
+            self._respect_rate_limits(url)
+            with self._client.stream("GET", url) as response:
+                if response.status_code != 200:
+                    return False
+                if self._outside_size_limits(
+                    url, response.headers, min_size
+                ) or self._has_rejected_type(url, response.headers, reject_types):
+                    return False
+                with open(file_path, "wb", buffering=0) as f:
                     for chunk in response.iter_bytes(chunk_size=chunk_size):
                         f.write(chunk)
-                return True
+            return True
+        except Exception as e:
+            logger.error(f"Error downloading file {url}: {e}")
             return False
+
+    def get_file_type(self, url: str) -> str:
+        """
+        Determine the file type from a URL.
+
+        Args:
+            url: URL to analyze
+
+        Returns:
+            str: File type category ('html', 'images', 'documents', 'videos', or 'skip')
+        """
+        from web_grabber.lib.browser_automation.base import BrowserAutomation
+
+        return BrowserAutomation.get_file_type(url)
+
+    def open_async_client(
+        self, max_connections: int = 10, max_per_host: Optional[int] = None
+    ) -> None:
+        """
+        Create the pooled async client used by the async request methods.
+
+        Must be called from within the event loop that will use the client.
+
+        Args:
+            max_connections: Maximum number of concurrent connections
+            max_per_host: Maximum number of concurrent requests to one host,
+                defaults to max_connections
+        """
+        self._host_slots = {}
+        self._max_per_host = max_per_host or max_connections
+
+        transport = httpx.AsyncHTTPTransport(
+            retries=self.retries,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                # Keep every connection alive; the crawl revisits the same hosts
+                max_keepalive_connections=max_connections,
+                max_connections=max_connections,
+                keepalive_expiry=30.0,
+            ),
+        )
+        self._async_client = httpx.AsyncClient(
+            transport=transport,
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={"User-Agent": self.user_agent},
+        )
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        """
+        Get the semaphore limiting concurrent async requests to a URL's host.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            asyncio.Semaphore: The slot shared by all requests to that host
+        """
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            # The event loop is single threaded, so no lock is needed here
+            slot = self._host_slots[host] = asyncio.Semaphore(self._max_per_host)
+        return slot
+
+    async def _async_respect_rate_limits(self, url: str) -> None:
+        """
+        Async counterpart of _respect_rate_limits that doesn't block the loop.
+
+        Args:
+            url: URL about to be requested
+        """
+        await self.rate_limiter.acquire_async(url)
+
+    async def async_get(
+        self,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        """
+        Make a GET request using the async client.
+
+        Args:
+            url: URL to request
+            params: Query parameters
+            headers: Additional headers
+
+        Returns:
+            httpx.Response object
+        """
+        async with self._host_slot(url):
+            await self._async_respect_rate_limits(url)
+
+            logger.debug("Async GET request to %s", url)
+            response = await self._async_client.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response
+
+    async def async_download_file(
+        self,
+        url: str,
+        file_path: str,
+        chunk_size: int = 131072,
+        min_size: int = 0,
+        reject_types: Tuple[str, ...] = (),
+    ) -> bool:
+        """
+        Stream a file from the specified URL to disk using the async client.
+
+        Args:
+            url: URL of the file to download
+            file_path: Path where to save the file
+            chunk_size: Size of chunks to use for streaming
+            min_size: Skip files declared smaller than this many bytes
+            reject_types: Skip files declared to be of a Content-Type starting
+                with one of these
+
+        Returns:
+            bool: True if download succeeded, False otherwise
+        """
+        try:
+            async with self._host_slot(url):
+                await self._async_respect_rate_limits(url)
+                async with self._async_client.stream("GET", url) as response:
+                    response.raise_for_status()
+                    if self._outside_size_limits(
+                        url, response.headers, min_size
+                    ) or self._has_rejected_type(url, response.headers, reject_types):
+                        return False
+                    with open(file_path, "wb", buffering=0) as f:
+                        async for chunk in response.aiter_bytes(chunk_size):
+                            f.write(chunk)
+            return True
         except Exception as e:
             logger.error(f"Error downloading file {url}: {e}")
             return False
 
-    def get_page_content(
-        self, url: str, wait_for_js: bool = False, scroll: bool = False
-    ) -> Tuple[str, Dict[str, List[str]]]:
+    async def async_fetch_page(self, url: str) -> Tuple[str, bytes]:
         """
-        Get the content of a page.
+        Fetch the HTML of a page using the async client, without parsing it.
 
         Args:
             url: URL of the page to get
-            wait_for_js: Whether to wait for JavaScript (not applicable for this handler)
-            scroll: Whether to scroll the page (not applicable for this handler)
 
         Returns:
-            Tuple[str, Dict[str, List[str]]]: HTML content and resources
+            Tuple[str, bytes]: The decoded page content and the raw body, or
+            empty ones if the request failed
         """
         try:
-            # Make the request
-            response = self.get(url)
+            response = await self.async_get(url)
 
-            # Check if successful
             if response.status_code != 200:
                 logger.warning(f"Got status code {response.status_code} for {url}")
-                return "", {}
-
-            # Get content
-            html_content = response.text
+                return "", b""
 
-            # Extract resources
-            from web_grabber.lib.browser_automation.base import BrowserAutomation
-
-            resources = BrowserAutomation.get_resources(url, html_content)
-
-            return html_content, resources
+            return response.text, response.content
         except Exception as e:
             logger.error(f"Error getting page content for {url}: {e}")
-            return "", {}
+            return "", b""
 
-    def get_file_type(self, url: str) -> str:
+    async def async_get_page_content(
+        self, url: str, wait_for_js: bool = False, scroll: bool = False
+    ) -> Tuple[str, Dict[str, List[str]]]:
         """
-        Determine the file type from a URL.
+        Get the content of a page using the async client.
 
         Args:
-            url: URL to analyze
+            url: URL of the page to get
+            wait_for_js: Whether to wait for JavaScript (not applicable for this handler)
+            scroll: Whether to scroll the page (not applicable for this handler)
 
         Returns:
-            str: File type category ('html', 'images', 'documents', 'videos', or 'skip')
+            Tuple[str, Dict[str, List[str]]]: HTML content and resources
         """
+        html_content, _ = await self.async_fetch_page(url)
+        if not html_content:
+            return "", {}
+
         from web_grabber.lib.browser_automation.base import BrowserAutomation
 
-        return BrowserAutomation.get_file_type(url)
+        return html_content, BrowserAutomation.get_resources(url, html_content)
+
+    async def async_close(self) -> None:
+        """Close the async client and release its connections."""
+        if self._async_client:
+            await self._async_client.aclose()
+            self._async_client = None
@@ -0,0 +1,121 @@
+"""Request rate limiting shared by worker threads and coroutines."""
+
+import asyncio
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+
+
+class RateLimiter:
+    """Thread-safe token bucket that allows one request per `delay` seconds."""
+
+    def __init__(self, delay: float = 0.0, burst: int = 1):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            delay (float): Minimum interval between requests in seconds
+            burst (int): Number of requests allowed back to back after idling
+        """
+        self.delay = delay
+        self.burst = burst
+        # Theoretical time of the next request if requests were evenly spaced
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        Reserve the next free request slot.
+
+        Each caller gets its own slot, so concurrent callers are spread out
+        instead of all waking up and firing at the same moment. Up to `burst`
+        slots may be taken early, which is the bucket holding that many tokens.
+
+        Returns:
+            float: Seconds to wait until the reserved slot
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_time)
+            self._next_time = slot + self.delay
+        return slot - (self.burst - 1) * self.delay - now
+
+    def acquire(self) -> None:
+        """Block the calling thread until it may make a request."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait until the calling coroutine may make a request."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class HostRateLimiter:
+    """Keeps a separate RateLimiter for every host, so hosts don't wait on each other."""
+
+    def __init__(self, delay: float = 0.0, burst: int = 1):
+        """
+        Initialize the per-host rate limiter.
+
+        Args:
+            delay (float): Minimum interval between requests to one host in seconds
+            burst (int): Number of requests one host may get back to back
+        """
+        self.delay = delay
+        self.burst = burst
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, delay: float, burst: int = 1) -> None:
+        """
+        Change the rate for all hosts, including ones already seen.
+
+        Args:
+            delay (float): Minimum interval between requests to one host in seconds
+            burst (int): Number of requests one host may get back to back
+        """
+        with self._lock:
+            self.delay = delay
+            self.burst = burst
+            for limiter in self._limiters.values():
+                limiter.delay = delay
+                limiter.burst = burst
+
+    def for_url(self, url: str) -> RateLimiter:
+        """
+        Get the limiter for a URL's host, creating it on first use.
+
+        Args:
+            url (str): URL about to be requested
+
+        Returns:
+            RateLimiter: The limiter shared by all requests to that host
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = RateLimiter(self.delay, self.burst)
+        return limiter
+
+    def acquire(self, url: str) -> None:
+        """
+        Block the calling thread until it may make a request to the URL's host.
+
+        Args:
+            url (str): URL about to be requested
+        """
+        self.for_url(url).acquire()
+
+    async def acquire_async(self, url: str) -> None:
+        """
+        Wait until the calling coroutine may make a request to the URL's host.
+
+        Args:
+            url (str): URL about to be requested
+        """
+        await self.for_url(url).acquire_async()
@@ -2,7 +2,7 @@
 
 import logging
 import socket
-from typing import Dict, List, Optional, Tuple
+from typing import Optional
 
 import requests
 import socks
@@ -113,42 +113,6 @@ class TorHandler(NetworkHandler):
 
         return BrowserAutomation.get_file_type(url)
 
-    def get_page_content(
-        self, url: str, wait_for_js: bool = False, scroll: bool = False
-    ) -> Tuple[str, Dict[str, List[str]]]:
-        """
-        Get the page content and related resources from a URL.
-
-        Args:
-            url: URL to request
-            wait_for_js: Whether to wait for JavaScript to load
-            scroll: Whether to scroll the page
-
-        Returns:
-            Tuple[str, Dict[str, List[str]]]: The page content and related resources
-        """
-        try:
-            # Make the request
-            response = self.get(url)
-
-            # Check if successful
-            if response.status_code != 200:
-                logger.warning(f"Got status code {response.status_code} for {url}")
-                return "", {}
-
-            # Get content
-            html_content = response.text
-
-            # Extract resources
-            from web_grabber.lib.browser_automation.base import BrowserAutomation
-
-            resources = BrowserAutomation.get_resources(url, html_content)
-
-            return html_content, resources
-        except Exception as e:
-            logger.error(f"Error getting page content for {url}: {e}")
-            return "", {}
-
 
 # Legacy compatibility functions
 def configure_tor(session: Optional[requests.Session] = None) -> requests.Session:
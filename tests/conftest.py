@@ -0,0 +1,61 @@
+"""Shared fixtures for the web-grabber tests."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """Serves the pages of the test site, counting requests per path."""
+
+    def do_GET(self):
+        site = self.server.site
+        with site.lock:
+            site.requests[self.path] = site.requests.get(self.path, 0) + 1
+            page = site.pages.get(self.path)
+
+        if page is None:
+            self.send_error(404)
+            return
+
+        body, content_type = page
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Site:
+    """A local web site whose pages can be changed between crawls."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.pages = {}
+        self.requests = {}
+        self.lock = threading.Lock()
+
+    def add(self, path, body, content_type="text/html; charset=utf-8"):
+        """Serve body at path; text is encoded as UTF-8."""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.pages[path] = (body, content_type)
+
+    def url(self, path):
+        return self.base_url + path
+
+
+@pytest.fixture
+def site():
+    """Run a local HTTP server for the duration of a test."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SiteHandler)
+    server.site = Site(f"http://127.0.0.1:{server.server_port}")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.site
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,144 @@
+import os
+import subprocess
+import urllib.request
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from web_grabber.cmd.grab.grab_handler import GrabHandler
+from web_grabber.lib.network import aria2_handler as aria2_package
+from web_grabber.lib.network.aria2_handler import Aria2Downloader, aria2_handler
+
+
+class _FakeAria2c:
+    """Stands in for the aria2c process, downloading with urllib."""
+
+    def __init__(self):
+        self.runs = []
+
+    def __call__(self, command, **kwargs):
+        input_file = command[1].partition("=")[2]
+        self.runs.append(command)
+
+        # Each download is a URL line followed by its indented options
+        downloads = []
+        for line in Path(input_file).read_text(encoding="utf-8").splitlines():
+            if not line.startswith(" "):
+                downloads.append({"url": line})
+            else:
+                key, _, value = line.strip().partition("=")
+                downloads[-1][key] = value
+
+        returncode = 0
+        for download in downloads:
+            file_path = Path(download["dir"]) / download["out"]
+            try:
+                with urllib.request.urlopen(download["url"]) as response:
+                    file_path.write_bytes(response.read())
+            except OSError:
+                # Like aria2c, leave the partial file and its control file
+                file_path.write_bytes(b"")
+                file_path.with_name(file_path.name + ".aria2").write_bytes(b"")
+                returncode = 1
+        return SimpleNamespace(returncode=returncode, stderr="")
+
+
+def _set_available(monkeypatch, available):
+    """Pretend aria2c is installed or not, wherever the flag is read."""
+    monkeypatch.setattr(aria2_package, "ARIA2_AVAILABLE", available)
+    monkeypatch.setattr(aria2_handler, "ARIA2_AVAILABLE", available)
+
+
+@pytest.fixture
+def aria2c(monkeypatch):
+    fake = _FakeAria2c()
+    monkeypatch.setattr(aria2_handler, "ARIA2_PATH", "aria2c")
+    _set_available(monkeypatch, True)
+    monkeypatch.setattr(
+        aria2_handler,
+        "subprocess",
+        SimpleNamespace(run=fake, DEVNULL=subprocess.DEVNULL, PIPE=subprocess.PIPE),
+    )
+    return fake
+
+
+def test_download_batch_runs_aria2c_once_per_batch(aria2c, site, tmp_path, monkeypatch):
+    monkeypatch.setattr(Aria2Downloader, "BATCH_SIZE", 2)
+    for n in range(5):
+        site.add(f"/{n}.png", f"image {n}".encode(), "image/png")
+    downloads = [(site.url(f"/{n}.png"), tmp_path / f"{n}.png") for n in range(5)]
+
+    results = Aria2Downloader().download_batch(downloads)
+
+    assert results == [True] * 5
+    assert len(aria2c.runs) == 3
+    assert (tmp_path / "3.png").read_bytes() == b"image 3"
+    # The input files are removed after each run
+    assert not any(os.path.exists(run[1].partition("=")[2]) for run in aria2c.runs)
+
+
+def test_download_batch_reports_and_removes_incomplete_files(aria2c, site, tmp_path):
+    site.add("/kept.png", b"image", "image/png")
+    downloads = [
+        (site.url("/missing.png"), tmp_path / "missing.png"),
+        (site.url("/kept.png"), tmp_path / "kept.png"),
+    ]
+
+    results = Aria2Downloader().download_batch(downloads)
+
+    assert results == [False, True]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["kept.png"]
+
+
+def test_aria2c_gets_the_crawl_settings(aria2c, tmp_path):
+    downloader = Aria2Downloader(user_agent="web-grabber-tests", timeout=7)
+
+    command = downloader._build_command(str(tmp_path / "input"))
+
+    assert command[0] == "aria2c"
+    assert "--user-agent=web-grabber-tests" in command
+    assert "--timeout=7" in command
+
+
+def test_downloader_needs_aria2c(monkeypatch):
+    _set_available(monkeypatch, False)
+
+    with pytest.raises(RuntimeError):
+        Aria2Downloader()
+
+
+def _crawl_with_aria2(site, tmp_path):
+    site.add("/", '<html><body><img src="/a.png"><img src="/b.png"></body></html>')
+    site.add("/a.png", b"\x89PNG\r\n\x1a\n" + bytes(200), "image/png")
+    site.add("/b.png", b"\x89PNG\r\n\x1a\n" + bytes(300), "image/png")
+
+    handler = GrabHandler()
+    handler.setup(
+        url=site.url("/"),
+        output_dir=str(tmp_path),
+        user_agent="web-grabber-tests",
+        timeout=5,
+        aria2=True,
+    )
+    handler.crawl(threads=2, delay=0, use_httpx=False)
+    return handler
+
+
+def test_crawl_downloads_resources_with_aria2c(aria2c, site, tmp_path):
+    handler = _crawl_with_aria2(site, tmp_path)
+
+    assert handler.aria2_downloader is not None
+    assert len(aria2c.runs) == 1
+    images = tmp_path / "files" / "images"
+    assert sorted(p.name for p in images.iterdir()) == ["a.png", "b.png"]
+
+
+def test_crawl_falls_back_without_aria2c(site, tmp_path, monkeypatch):
+    _set_available(monkeypatch, False)
+
+    handler = _crawl_with_aria2(site, tmp_path)
+
+    assert handler.aria2_downloader is None
+    images = tmp_path / "files" / "images"
+    assert sorted(p.name for p in images.iterdir()) == ["a.png", "b.png"]
@@ -0,0 +1,64 @@
+"""Tests for the Bloom filter backed visited-URL set."""
+
+from web_grabber.lib.dedup import BloomFilter, VisitedUrlSet
+
+_URLS = [f"https://example.com/page/{n}" for n in range(100)]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 1e-3)
+    for url in _URLS:
+        bloom.add(url)
+
+    assert all(url in bloom for url in _URLS)
+    assert len(bloom) == len(_URLS)
+
+
+def test_bloom_filter_counts_each_item_once():
+    bloom = BloomFilter(1000, 1e-3)
+
+    assert not bloom.add(_URLS[0])
+    assert bloom.add(_URLS[0])
+    assert len(bloom) == 1
+
+
+def test_reopened_filter_keeps_its_items_and_count(tmp_path):
+    path = tmp_path / "visited.bloom"
+    visited = VisitedUrlSet(1000, 1e-3, path=path, reset=True)
+    for url in _URLS:
+        visited.add(url)
+    visited.close()
+
+    reopened = VisitedUrlSet(1000, 1e-3, path=path)
+
+    assert all(url in reopened for url in _URLS)
+    assert len(reopened) == len(_URLS)
+    reopened.add("https://example.com/new")
+    assert len(reopened) == len(_URLS) + 1
+    reopened.close()
+
+
+def test_reset_filter_forgets_its_items(tmp_path):
+    path = tmp_path / "visited.bloom"
+    visited = VisitedUrlSet(1000, 1e-3, path=path, reset=True)
+    visited.add(_URLS[0])
+    visited.close()
+
+    reopened = VisitedUrlSet(1000, 1e-3, path=path, reset=True)
+
+    assert _URLS[0] not in reopened
+    assert len(reopened) == 0
+    reopened.close()
+
+
+def test_filter_sized_differently_starts_empty(tmp_path):
+    path = tmp_path / "visited.bloom"
+    visited = VisitedUrlSet(1000, 1e-3, path=path, reset=True)
+    visited.add(_URLS[0])
+    visited.close()
+
+    reopened = VisitedUrlSet(5000, 1e-3, path=path)
+
+    assert _URLS[0] not in reopened
+    assert len(reopened) == 0
+    reopened.close()
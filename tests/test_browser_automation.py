@@ -0,0 +1,71 @@
+import pytest
+
+from web_grabber.cmd.grab.grab_handler import GrabHandler
+from web_grabber.lib.browser_automation.base import BrowserAutomation
+
+canonicalize_url = BrowserAutomation.canonicalize_url
+
+
+@pytest.mark.parametrize(
+    "variant",
+    [
+        "https://example.com/docs/intro",
+        "https://example.com/docs/intro/",
+        "https://example.com/docs/intro#install",
+        "HTTPS://Example.COM/docs/intro",
+        "https://example.com:443/docs/intro",
+        "https://example.com/docs/intro?utm_source=feed&utm_medium=rss",
+        "https://example.com/docs/intro?fbclid=abc",
+    ],
+)
+def test_canonicalize_url_merges_variants_of_a_page(variant):
+    assert canonicalize_url(variant) == "https://example.com/docs/intro"
+
+
+def test_canonicalize_url_sorts_query_parameters():
+    assert canonicalize_url("https://example.com/search?q=grab&page=2") == (
+        canonicalize_url("https://example.com/search?page=2&q=grab")
+    )
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("https://example.com/list?page=2", "https://example.com/list?page=3"),
+        ("https://example.com/Docs", "https://example.com/docs"),
+        ("http://example.com/", "https://example.com/"),
+        ("https://example.com:8443/", "https://example.com/"),
+    ],
+)
+def test_canonicalize_url_keeps_distinct_pages_apart(first, second):
+    assert canonicalize_url(first) != canonicalize_url(second)
+
+
+def test_canonicalize_url_keeps_the_root_path():
+    assert canonicalize_url("https://example.com") == "https://example.com/"
+    assert canonicalize_url("https://example.com/") == "https://example.com/"
+
+
+def test_crawl_fetches_each_canonical_page_once(site, tmp_path):
+    site.add(
+        "/",
+        "<html><body>"
+        '<a href="/about">About</a>'
+        '<a href="/about/">About</a>'
+        '<a href="/about#team">Team</a>'
+        '<a href="/about?utm_source=nav">About</a>'
+        "</body></html>",
+    )
+    site.add("/about", "<html><body><p>About us</p></body></html>")
+
+    handler = GrabHandler()
+    handler.setup(
+        url=site.url("/"),
+        output_dir=str(tmp_path),
+        user_agent="web-grabber-tests",
+        timeout=5,
+        max_depth=100,
+    )
+    handler.crawl(threads=2, delay=0, use_httpx=False)
+
+    assert site.requests == {"/": 1, "/about": 1}
@@ -0,0 +1,82 @@
+import socket
+from types import SimpleNamespace
+
+import pytest
+
+from web_grabber.lib.network import dns_cache
+from web_grabber.lib.network.dns_cache import DnsCache
+
+_ADDRESS = (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", 80))
+
+
+class _Resolver:
+    """Stands in for socket.getaddrinfo, counting lookups per host."""
+
+    def __init__(self):
+        self.lookups = {}
+        self.failing = set()
+
+    def __call__(self, host, port, family=0, type=0, proto=0, flags=0):
+        self.lookups[host] = self.lookups.get(host, 0) + 1
+        if host in self.failing:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [_ADDRESS]
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    resolver = _Resolver()
+    monkeypatch.setattr(socket, "getaddrinfo", resolver)
+    return resolver
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=100.0)
+    fake_time = SimpleNamespace(monotonic=lambda: clock.now)
+    monkeypatch.setattr(dns_cache, "time", fake_time)
+    return clock
+
+
+def test_dns_cache_resolves_each_host_once(resolver, clock):
+    with DnsCache():
+        for _ in range(3):
+            assert socket.getaddrinfo("example.com", 80) == [_ADDRESS]
+        socket.getaddrinfo("example.org", 80)
+
+    assert resolver.lookups == {"example.com": 1, "example.org": 1}
+
+
+def test_dns_cache_looks_hosts_up_again_after_the_ttl(resolver, clock):
+    with DnsCache(ttl=60):
+        socket.getaddrinfo("example.com", 80)
+        clock.now += 61
+        socket.getaddrinfo("example.com", 80)
+
+    assert resolver.lookups == {"example.com": 2}
+
+
+def test_dns_cache_does_not_remember_failures(resolver, clock):
+    resolver.failing.add("example.com")
+
+    with DnsCache():
+        with pytest.raises(socket.gaierror):
+            socket.getaddrinfo("example.com", 80)
+        resolver.failing.clear()
+        assert socket.getaddrinfo("example.com", 80) == [_ADDRESS]
+
+    assert resolver.lookups == {"example.com": 2}
+
+
+def test_dns_cache_hands_out_copies(resolver, clock):
+    with DnsCache():
+        socket.getaddrinfo("example.com", 80).clear()
+
+        assert socket.getaddrinfo("example.com", 80) == [_ADDRESS]
+
+
+def test_dns_cache_restores_getaddrinfo_on_exit(resolver):
+    with DnsCache():
+        assert socket.getaddrinfo is not resolver
+
+    assert socket.getaddrinfo is resolver
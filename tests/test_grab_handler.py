@@ -0,0 +1,311 @@
+"""Tests for the grab command's crawl handler."""
+
+import asyncio
+import importlib.util
+import socket
+import threading
+
+import pytest
+
+from web_grabber.cmd.grab.grab_handler import GrabHandler, _content_fingerprint
+from web_grabber.lib.browser_automation import BrowserAutomation
+from web_grabber.lib.network import HttpxHandler, NetworkHandler, TorHandler
+
+_PAGE = '<html><body><p>{text}</p><a href="{link}">Next</a></body></html>'
+
+
+class _StaticPages:
+    """Network handler serving fixed HTML for each URL."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def fetch_page(self, url):
+        page = self.pages[url]
+        if callable(page):
+            page = page()
+        return page, page.encode("utf-8")
+
+
+def _set_up(url, output_dir, **options):
+    """Set up a handler the way grab_command does, apart from the backend."""
+    handler = GrabHandler()
+    handler.setup(
+        url=url,
+        output_dir=str(output_dir),
+        user_agent="web-grabber-tests",
+        timeout=5,
+        max_depth=100,
+        **options,
+    )
+    return handler
+
+
+def _close(handler):
+    handler.network_handler.close()
+    handler._close_failed_log()
+
+
+def _make_handler(pages):
+    handler = GrabHandler()
+    handler.network_handler = _StaticPages(pages)
+    handler.resources = False
+    handler._base_domain = "example.com"
+    handler.saved = []
+    handler._save_html_content = lambda url, html: handler.saved.append(url)
+    return handler
+
+
+def test_fingerprint_keeps_paginated_links_distinct():
+    page_2 = _PAGE.format(text="Results", link="/list/page/3")
+    page_3 = _PAGE.format(text="Results", link="/list/page/4")
+
+    assert _content_fingerprint(page_2) != _content_fingerprint(page_3)
+
+
+def test_fingerprint_ignores_digits_and_whitespace_in_text():
+    first = _PAGE.format(text="Viewed 12 times", link="/about")
+    second = _PAGE.format(text="Viewed  1305 times\n", link="/about")
+
+    assert _content_fingerprint(first) == _content_fingerprint(second)
+
+
+@pytest.mark.parametrize(
+    "body, expected",
+    [
+        (b"\x89PNG\r\n\x1a\n" + bytes(5000), "images"),
+        (b"\xff\xd8\xff\xe0" + bytes(5000), "images"),
+        (b"GIF89a" + bytes(5000), "images"),
+        (b"%PDF-1.7\n" + bytes(5000), "documents"),
+        (_PAGE.format(text="Hi", link="/").encode("utf-8"), "html"),
+        (_PAGE.format(text="Hi", link="/"), "html"),
+        (bytes(5000), "documents"),
+    ],
+)
+def test_detect_content_type_reads_signatures_from_raw_bytes(body, expected):
+    assert GrabHandler()._detect_content_type(body) == expected
+
+
+def test_paginated_pages_are_all_saved_and_followed():
+    pages = {
+        f"https://example.com/list/page/{n}": _PAGE.format(
+            text=f"Page {n}", link=f"/list/page/{n + 1}"
+        )
+        for n in (1, 2)
+    }
+    handler = _make_handler(pages)
+
+    for url in pages:
+        handler.process_page(url)
+
+    assert handler.saved == list(pages)
+    assert "https://example.com/list/page/3" in handler.to_visit
+
+
+def test_duplicate_page_is_not_saved_but_its_links_are_followed():
+    # Same markup under two directories, so the relative link resolves apart
+    html = _PAGE.format(text="Archive", link="next")
+    handler = _make_handler(
+        {"https://example.com/a/": html, "https://example.com/b/": html}
+    )
+
+    handler.process_page("https://example.com/a/")
+    handler.process_page("https://example.com/b/")
+
+    assert handler.saved == ["https://example.com/a/"]
+    assert list(handler.to_visit) == [
+        "https://example.com/a/next",
+        "https://example.com/b/next",
+    ]
+
+
+def test_interrupted_pages_are_saved_as_pending_and_resumed(tmp_path):
+    slow_url = "https://example.com/slow"
+    release = threading.Event()
+
+    def slow_page():
+        release.wait(5)
+        return _PAGE.format(text="Slow", link="/")
+
+    def interrupt():
+        raise KeyboardInterrupt
+
+    handler = _make_handler(
+        {slow_url: slow_page, "https://example.com/stop": interrupt}
+    )
+    handler.output_path = tmp_path
+    handler.to_visit.extend([slow_url, "https://example.com/stop"])
+
+    with pytest.raises(KeyboardInterrupt):
+        handler._crawl_pages(threads=2)
+    handler._save_pending_urls()
+    release.set()
+
+    assert (tmp_path / "pending_urls.txt").read_text() == f"{slow_url}\n"
+
+    # The slow page was claimed before the interrupt, as the persisted Bloom
+    # filter would remember on resume
+    resumed = _make_handler({slow_url: _PAGE.format(text="Slow", link="/")})
+    resumed.output_path = tmp_path
+    resumed.already_visited.add(BrowserAutomation.canonicalize_url(slow_url))
+    resumed._load_pending_urls()
+    resumed._crawl_pages(threads=2)
+
+    assert resumed.saved == [slow_url]
+
+
+@pytest.mark.parametrize(
+    ("options", "handler_type"),
+    [
+        ({"httpx": True}, HttpxHandler),
+        ({}, NetworkHandler),
+        ({"tor": True}, TorHandler),
+    ],
+)
+def test_setup_creates_the_network_handler_for_each_backend(
+    tmp_path, monkeypatch, options, handler_type
+):
+    # TorHandler routes every new socket through its proxy; undo that after
+    monkeypatch.setattr(socket, "socket", socket.socket)
+
+    handler = _set_up("https://www.example.com/docs/", tmp_path, **options)
+    try:
+        assert type(handler.network_handler) is handler_type
+        assert handler._base_domain == "www.example.com"
+        assert list(handler.to_visit) == ["https://www.example.com/docs/"]
+        assert (tmp_path / "files" / "images").is_dir()
+        assert (tmp_path / "failed_urls.txt").exists()
+    finally:
+        _close(handler)
+
+
+@pytest.mark.parametrize(
+    ("option", "package"), [("selenium", "selenium"), ("camoufox", "camoufox")]
+)
+def test_setup_falls_back_to_plain_browser_without_its_package(
+    tmp_path, option, package
+):
+    if importlib.util.find_spec(package):
+        pytest.skip(f"{package} is installed and would start a real browser")
+
+    handler = _set_up("https://example.com/", tmp_path, **{option: True})
+    try:
+        assert type(handler.browser_handler) is BrowserAutomation
+    finally:
+        _close(handler)
+
+
+def test_httpx_crawl_saves_pages_and_resources(site, tmp_path):
+    site.add(
+        "/",
+        '<html><body><a href="/about">About</a><img src="/logo.png"></body></html>',
+    )
+    site.add("/about", "<html><body><p>About us</p></body></html>")
+    site.add("/logo.png", b"\x89PNG\r\n\x1a\n" + bytes(200), "image/png")
+
+    handler = _set_up(site.url("/"), tmp_path, httpx=True)
+    handler.crawl(threads=2, delay=0, use_httpx=True)
+
+    assert sorted(p.name for p in (tmp_path / "html").iterdir()) == [
+        "about.html",
+        "index.html",
+    ]
+    assert [p.name for p in (tmp_path / "files" / "images").iterdir()] == ["logo.png"]
+    assert handler.get_summary()["failed_urls"] == 0
+
+
+def test_async_crawl_fetches_every_page_once(site, tmp_path):
+    links = "".join(f'<a href="/p{n}">Page {n}</a>' for n in range(20))
+    site.add("/", f"<html><body>{links}</body></html>")
+    for n in range(20):
+        site.add(f"/p{n}", _PAGE.format(text=f"Page {n}", link=f"/p{(n + 1) % 20}"))
+
+    handler = _set_up(site.url("/"), tmp_path, httpx=True)
+    network_handler = handler.network_handler
+    handler.crawl(threads=4, delay=0, use_httpx=True)
+
+    assert set(site.requests.values()) == {1}
+    assert len(site.requests) == 21
+    assert len(list((tmp_path / "html").iterdir())) == 21
+    # The pooled client is only open for the crawl
+    assert network_handler._async_client is None
+
+
+def test_async_crawl_keeps_threads_pages_in_flight(site, tmp_path):
+    links = "".join(f'<a href="/p{n}">Page {n}</a>' for n in range(8))
+    site.add("/", f"<html><body>{links}</body></html>")
+    for n in range(8):
+        site.add(f"/p{n}", f"<html><body><p>Page {n}</p></body></html>")
+
+    handler = _set_up(site.url("/"), tmp_path, httpx=True)
+    process_page_async = handler.process_page_async
+    pages = {"active": 0, "peak": 0}
+
+    async def tracked(url):
+        pages["active"] += 1
+        pages["peak"] = max(pages["peak"], pages["active"])
+        try:
+            # Hold the slot long enough for the others to be filled
+            await asyncio.sleep(0.01)
+            await process_page_async(url)
+        finally:
+            pages["active"] -= 1
+
+    handler.process_page_async = tracked
+    handler.crawl(threads=3, delay=0, use_httpx=True)
+
+    assert pages["peak"] == 3
+    assert len(site.requests) == 9
+
+
+@pytest.mark.parametrize("backend", ["requests", "httpx"])
+def test_crawl_downloads_pages_that_turn_out_to_be_images(site, tmp_path, backend):
+    site.add("/", '<html><body><a href="/avatar">Avatar</a></body></html>')
+    site.add("/avatar", b"\x89PNG\r\n\x1a\n" + bytes(200), "image/png")
+
+    use_httpx = backend == "httpx"
+    handler = _set_up(site.url("/"), tmp_path, httpx=use_httpx)
+    handler.crawl(threads=2, delay=0, use_httpx=use_httpx)
+
+    assert [p.name for p in (tmp_path / "html").iterdir()] == ["index.html"]
+    assert len(list((tmp_path / "files" / "images").iterdir())) == 1
+    assert handler.get_summary()["failed_urls"] == 0
+
+
+@pytest.mark.parametrize("bloom_capacity", [0, 1000])
+def test_retry_failed_fetches_failed_urls_again(site, tmp_path, bloom_capacity):
+    site.add("/", '<html><body><a href="/later">Later</a></body></html>')
+    options = {"httpx": True, "bloom_capacity": bloom_capacity}
+
+    handler = _set_up(site.url("/"), tmp_path, **options)
+    handler.crawl(threads=2, delay=0, use_httpx=True)
+    assert (tmp_path / "failed_urls.txt").read_text() == f"{site.url('/later')}\n"
+
+    # The page comes back, and the retry finds it without refetching the rest
+    site.add("/later", "<html><body><p>Back again</p></body></html>")
+    retry = _set_up(site.url("/"), tmp_path, retry_failed=True, **options)
+    retry.crawl(threads=2, delay=0, use_httpx=True)
+
+    assert site.requests["/later"] == 2
+    assert (tmp_path / "html" / "later.html").exists()
+    assert (tmp_path / "failed_urls.txt").read_text() == ""
+    if bloom_capacity:
+        assert site.requests["/"] == 1
+
+
+def test_resumed_crawl_keeps_counting_toward_max_depth(site, tmp_path):
+    site.add("/", '<html><body><a href="/a">A</a><a href="/b">B</a></body></html>')
+    site.add("/a", "<html><body><p>A</p></body></html>")
+    site.add("/b", "<html><body><p>B</p></body></html>")
+    options = {"httpx": True, "bloom_capacity": 1000}
+
+    handler = _set_up(site.url("/"), tmp_path, **options)
+    handler.crawl(threads=1, delay=0, use_httpx=True)
+    handler.already_visited.close()
+
+    resumed = _set_up(site.url("/"), tmp_path, retry_failed=True, **options)
+
+    assert len(resumed.already_visited) == 3
+    resumed.max_depth = 3
+    assert not resumed._should_process_url(site.url("/c"))
+    _close(resumed)
@@ -0,0 +1,115 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from web_grabber.lib.network import rate_limiter
+from web_grabber.lib.network.rate_limiter import HostRateLimiter, RateLimiter
+
+
+class _Clock:
+    """Stands in for time.monotonic and the sleeps, recording each wait."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def sleep_async(self, seconds):
+        self.sleep(seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    fake_time = SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep)
+    monkeypatch.setattr(rate_limiter, "time", fake_time)
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", clock.sleep_async)
+    return clock
+
+
+def test_rate_limiter_spaces_requests_by_delay(clock):
+    limiter = RateLimiter(delay=1.0)
+
+    for _ in range(3):
+        limiter.acquire()
+
+    assert clock.sleeps == [1.0, 1.0]
+
+
+def test_rate_limiter_lets_a_burst_through_after_idling(clock):
+    limiter = RateLimiter(delay=1.0, burst=3)
+
+    for _ in range(4):
+        limiter.acquire()
+
+    assert clock.sleeps == [1.0]
+
+
+def test_rate_limiter_does_not_wait_after_a_long_pause(clock):
+    limiter = RateLimiter(delay=1.0)
+    limiter.acquire()
+
+    clock.now += 10
+    limiter.acquire()
+
+    assert clock.sleeps == []
+
+
+def test_rate_limiter_without_delay_never_waits(clock):
+    limiter = RateLimiter()
+
+    for _ in range(5):
+        limiter.acquire()
+
+    assert clock.sleeps == []
+
+
+def test_rate_limiter_paces_coroutines_too(clock):
+    limiter = RateLimiter(delay=0.5)
+
+    async def crawl():
+        for _ in range(3):
+            await limiter.acquire_async()
+
+    asyncio.run(crawl())
+
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_host_rate_limiter_paces_each_host_separately(clock):
+    limiter = HostRateLimiter(delay=1.0)
+
+    limiter.acquire("https://example.com/a")
+    limiter.acquire("https://example.org/a")
+    assert clock.sleeps == []
+
+    limiter.acquire("https://example.com/b")
+    assert clock.sleeps == [1.0]
+
+
+def test_host_rate_limiter_shares_one_bucket_per_host(clock):
+    limiter = HostRateLimiter(delay=1.0)
+
+    first = limiter.for_url("https://example.com/a")
+
+    assert limiter.for_url("https://example.com/b?page=2") is first
+    assert limiter.for_url("https://sub.example.com/a") is not first
+
+
+def test_host_rate_limiter_configure_updates_known_hosts(clock):
+    limiter = HostRateLimiter()
+    limiter.acquire("https://example.com/a")
+
+    limiter.configure(delay=2.0, burst=2)
+    for _ in range(3):
+        limiter.acquire("https://example.com/a")
+
+    assert limiter.for_url("https://example.com/").delay == 2.0
+    assert clock.sleeps == [2.0]